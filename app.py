@@ -7,31 +7,53 @@ streamline recruitment processes with intelligent conversation and a user-friend
 Created by: Goddati Bhavyasri
 """
 
-import os
-import time
-import json
-import random
+import re
+import logging
 import streamlit as st
-import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Tuple, Any, Optional
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from string import Template
+from typing import Dict, List, Tuple
+from uuid import uuid4
 
 # Import custom modules and utilities
 from utils import (
     validate_input, 
-    format_chat_history, 
-    get_full_response,
+    stream_response,
+    coalesce_stream,
     export_chat_history_to_csv, 
     export_chat_history_to_txt,
     get_initials, 
     calculate_role_match, 
     generate_custom_interview_questions,
+    stream_custom_interview_questions,
     load_dotenv,
     check_api_credentials
 )
 from styles import apply_custom_styles
 from prompts import PRIVACY_NOTICE, SYSTEM_PROMPTS, CONVERSATION_TEMPLATES
 
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Matches individual skill tokens in a free-form tech stack
+_SKILL_RE = re.compile(r'[^,;|\s]+')
+
+# Prompt context limits for the open conversation: at most this many recent
+# turns, trimmed to roughly 1000 tokens (about 4 characters per token)
+_CONTEXT_MAX_TURNS = 10
+_CONTEXT_CHAR_BUDGET = 4000
+
+# Phrases that close the screening conversation, matched as whole words
+_END_RE = re.compile(
+    r"\b(?:thank you for your time|have a great day|goodbye|bye|end|exit)\b",
+    re.IGNORECASE
+)
+
 # Load environment variables from .env file (if it exists)
 load_dotenv()
 
@@ -46,11 +68,29 @@ st.set_page_config(
 # Apply custom styles
 apply_custom_styles()
 
-# Initialize session state variables
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
-if "candidate_info" not in st.session_state:
-    st.session_state.candidate_info = {
+_LOGO_PATH = Path("assets/logo.jpg")
+
+@st.cache_resource
+def _load_logo():
+    """Load and decode the header logo once per process, or None if it is missing."""
+    from PIL import Image
+    
+    if not _LOGO_PATH.is_file():
+        return None
+    
+    logo = Image.open(_LOGO_PATH)
+    logo.load()
+    return logo
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_api_status() -> bool:
+    """Check API credentials once and share the result across sessions."""
+    return check_api_credentials()
+
+# Session state defaults, stored as factories so every session gets fresh objects
+_SESSION_DEFAULTS = {
+    "chat_history": list,
+    "candidate_info": lambda: {
         "name": "",
         "email": "",
         "phone": "",
@@ -58,26 +98,157 @@ if "candidate_info" not in st.session_state:
         "position": "",
         "location": "",
         "tech_stack": ""
-    }
-if "collection_complete" not in st.session_state:
-    st.session_state.collection_complete = False
-if "conversation_state" not in st.session_state:
-    st.session_state.conversation_state = "initial"
-if "conversation_ended" not in st.session_state:
-    st.session_state.conversation_ended = False
-if "custom_questions" not in st.session_state:
-    st.session_state.custom_questions = ""
-if "custom_questions_generated" not in st.session_state:
-    st.session_state.custom_questions_generated = False
-if "privacy_agreed" not in st.session_state:
-    st.session_state.privacy_agreed = False
-if "candidate_id" not in st.session_state:
+    },
+    "collection_complete": lambda: False,
+    "conversation_state": lambda: "initial",
+    "conversation_ended": lambda: False,
+    "custom_questions": lambda: "",
+    "custom_questions_generated": lambda: False,
+    "privacy_agreed": lambda: False,
     # Generate a unique ID for this candidate session
-    st.session_state.candidate_id = f"candidate_{int(time.time())}_{random.randint(1000, 9999)}"
-if "error_count" not in st.session_state:
-    st.session_state.error_count = 0
-if "api_status" not in st.session_state:
-    st.session_state.api_status = check_api_credentials()
+    "candidate_id": lambda: f"candidate_{uuid4().hex[:12]}",
+    "error_count": lambda: 0,
+    # Last few messages, pre-formatted as LLM prompt context
+    "recent_context": lambda: deque(maxlen=_CONTEXT_MAX_TURNS),
+    "api_status": _cached_api_status
+}
+
+# Initialize session state variables
+for key, factory in _SESSION_DEFAULTS.items():
+    if key not in st.session_state:
+        st.session_state[key] = factory()
+
+@st.cache_data(show_spinner=False)
+def _cached_role_match(tech_stack: str, experience: str, position: str) -> Tuple[int, List[str]]:
+    """Cached wrapper around calculate_role_match for repeated profile renders."""
+    return calculate_role_match(tech_stack, experience, position)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _csv_bytes(history_len: int, candidate_id: str,
+               _chat_history: List[Dict[str, str]], _candidate_info: Dict[str, str]) -> bytes:
+    """CSV export cached per (transcript length, candidate) pair."""
+    return export_chat_history_to_csv(_chat_history, _candidate_info)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _txt_bytes(history_len: int, candidate_id: str,
+               _chat_history: List[Dict[str, str]], _candidate_info: Dict[str, str]) -> bytes:
+    """Text export cached per (transcript length, candidate) pair."""
+    return export_chat_history_to_txt(_chat_history, _candidate_info)
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide worker pool for background LLM jobs."""
+    return ThreadPoolExecutor(max_workers=4)
+
+# Characters that need escaping before user text goes into card markup
+_HTML_SPECIAL = frozenset("&<>\"'")
+
+def _escape_html(text: str) -> str:
+    """Escape user text for HTML, returning plain strings without copying them."""
+    if _HTML_SPECIAL.isdisjoint(text):
+        return text
+    return escape(text, quote=True)
+
+@lru_cache(maxsize=256)
+def _mask_email(email: str) -> str:
+    """Hide all but the first three characters of the email username."""
+    if '@' in email:
+        username, domain = email.split('@')
+        if len(username) > 3:
+            return f"{username[:3]}{'*' * (len(username)-3)}@{domain}"
+        return f"{'*' * len(username)}@{domain}"
+    return email
+
+@lru_cache(maxsize=256)
+def _mask_phone(phone: str) -> str:
+    """Hide all but the last four digits of the phone number."""
+    if len(phone) > 4:
+        return f"{'*' * (len(phone)-4)}{phone[-4:]}"
+    return phone
+
+# Profile card markup. Fragments are kept unindented so markdown doesn't
+# treat them as code blocks; the details div is closed by the caller.
+_PROFILE_HEADER_TMPL = Template(
+    "<div class='section-title'>Candidate Profile</div>"
+    "<div class='candidate-profile-card'>"
+    "<div class='profile-header'>"
+    "<div class='profile-picture'>${initials}</div>"
+    "<div class='profile-info'>"
+    "<div class='profile-name'>${name}</div>"
+    "<div class='profile-position'>📌 ${position}</div>"
+    "<div class='profile-location'>📍 ${location}</div>"
+    "</div>"
+    "</div>"
+    "<div class='profile-details'>"
+    "<div class='detail-row'>"
+    "<div class='detail-label'>💼 Experience</div>"
+    "<div class='detail-value'>${experience} years</div>"
+    "</div>"
+)
+
+_DETAIL_ROW_TMPL = Template(
+    "<div class='detail-row'>"
+    "<div class='detail-label'>${label}</div>"
+    "<div class='detail-value'>${value}</div>"
+    "</div>"
+)
+
+_PROFILE_FOOTER_TMPL = Template(
+    "<div class='match-score'>"
+    "<div class='match-label'>Role Match</div>"
+    "<div class='match-value'>${match_score}%</div>"
+    "<div class='match-bar-container'>"
+    "<div class='match-bar' style='width: ${match_score}%;'></div>"
+    "</div>"
+    "</div>"
+    "</div>"
+)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_profile_html(name: str, position: str, experience: str, location: str,
+                        email: str, phone: str, skills: Tuple[str, ...],
+                        match_score: int, matching_skills: Tuple[str, ...]) -> str:
+    """
+    Build the candidate profile card markup.
+    
+    Cached on the displayed fields, so reruns of the completion page reuse
+    the same HTML string. Email and phone are masked here, and free-text
+    fields are escaped since the card is rendered with unsafe_allow_html.
+    """
+    # Get candidate initials for avatar
+    initials = get_initials(name)
+    
+    # Build the whole card as one HTML string so it renders in a single element
+    parts = [_PROFILE_HEADER_TMPL.substitute(
+        initials=_escape_html(initials), name=_escape_html(name), position=_escape_html(position),
+        location=_escape_html(location), experience=_escape_html(experience)
+    )]
+    
+    # Display email and phone if available
+    if email:
+        # Secure display for email
+        parts.append(_DETAIL_ROW_TMPL.substitute(label="📧 Email", value=_escape_html(_mask_email(email))))
+    
+    if phone:
+        # Secure display for phone
+        parts.append(_DETAIL_ROW_TMPL.substitute(label="📱 Phone", value=_escape_html(_mask_phone(phone))))
+    
+    parts.append("</div>")
+    
+    # Skills section - display skills as tags
+    if skills:
+        # Color matching skills; calculate_role_match returns them lowercased
+        matching_lower = frozenset(matching_skills)
+        tags_html = "".join(
+            f"<span class='{'skill-tag match' if skill.lower() in matching_lower else 'skill-tag'}'>{_escape_html(skill)}</span>"
+            for skill in skills
+        )
+        parts.append(f"<div class='skill-tags'>{tags_html}</div>")
+    
+    # Match score indicator and close profile card
+    parts.append(_PROFILE_FOOTER_TMPL.substitute(match_score=match_score))
+    
+    return "".join(parts)
 
 def display_candidate_profile(candidate_info: Dict[str, str]):
     """Display a rich candidate profile card with avatar, info, and match score."""
@@ -93,115 +264,35 @@ def display_candidate_profile(candidate_info: Dict[str, str]):
     
     if tech_stack and position:
         try:
-            match_score, matching_skills = calculate_role_match(tech_stack, experience, position)
-        except Exception as e:
-            st.error(f"Error calculating match score: {str(e)}")
-            matching_skills = []
+            # Normalize inputs so equivalent profiles share a cache entry
+            match_score, matching_skills = _cached_role_match(
+                tech_stack.strip().lower(), experience.strip(), position.strip().lower()
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            # Fall back to the default score rather than adding an error element to the card
+            logger.warning(f"Error calculating match score: {str(e)}")
+            match_score, matching_skills = 50, []
     else:
         matching_skills = []
     
-    # Get candidate initials for avatar
-    initials = get_initials(name)
-    
-    # Create profile card
-    st.markdown("<div class='section-title'>Candidate Profile</div>", unsafe_allow_html=True)
-    
-    # Profile container
-    st.markdown("<div class='candidate-profile-card'>", unsafe_allow_html=True)
-    
-    # Profile header with avatar/initials and basic info
-    st.markdown(f"""
-    <div class='profile-header'>
-        <div class='profile-picture'>{initials}</div>
-        <div class='profile-info'>
-            <div class='profile-name'>{name}</div>
-            <div class='profile-position'>📌 {position}</div>
-            <div class='profile-location'>📍 {location}</div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Profile details
-    st.markdown("<div class='profile-details'>", unsafe_allow_html=True)
+    # Skills are split once when the tech stack is collected
+    skills = candidate_info.get("skills_list") or _SKILL_RE.findall(tech_stack)
     
-    # Experience
-    st.markdown(f"""
-    <div class='detail-row'>
-        <div class='detail-label'>💼 Experience</div>
-        <div class='detail-value'>{experience} years</div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Display email and phone if available
-    if candidate_info.get('email'):
-        email = candidate_info.get('email', '')
-        # Secure display for email
-        if '@' in email:
-            username, domain = email.split('@')
-            if len(username) > 3:
-                masked_email = f"{username[:3]}{'*' * (len(username)-3)}@{domain}"
-            else:
-                masked_email = f"{'*' * len(username)}@{domain}"
-        else:
-            masked_email = email
-            
-        st.markdown(f"""
-        <div class='detail-row'>
-            <div class='detail-label'>📧 Email</div>
-            <div class='detail-value'>{masked_email}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    if candidate_info.get('phone'):
-        phone = candidate_info.get('phone', '')
-        # Secure display for phone
-        if len(phone) > 4:
-            masked_phone = f"{'*' * (len(phone)-4)}{phone[-4:]}"
-        else:
-            masked_phone = phone
-            
-        st.markdown(f"""
-        <div class='detail-row'>
-            <div class='detail-label'>📱 Phone</div>
-            <div class='detail-value'>{masked_phone}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("</div>", unsafe_allow_html=True)
-    
-    # Skills section - extract skills from tech_stack and display as tags
-    if tech_stack:
-        # Extract individual skills (split by commas, spaces, etc.)
-        skills = [skill.strip() for skill in tech_stack.replace(',', ' ').split() if skill.strip()]
-        
-        # Display skills with coloring for matching skills
-        st.markdown("<div class='skill-tags'>", unsafe_allow_html=True)
-        
-        for skill in skills:
-            skill_class = "skill-tag match" if skill.lower() in [s.lower() for s in matching_skills] else "skill-tag"
-            st.markdown(f"<span class='{skill_class}'>{skill}</span>", unsafe_allow_html=True)
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-    
-    # Match score indicator
-    st.markdown(f"""
-    <div class='match-score'>
-        <div class='match-label'>Role Match</div>
-        <div class='match-value'>{match_score}%</div>
-        <div class='match-bar-container'>
-            <div class='match-bar' style='width: {match_score}%;'></div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Close profile card
-    st.markdown("</div>", unsafe_allow_html=True)
+    profile_html = _build_profile_html(
+        name, position, experience, location,
+        candidate_info.get('email', ''), candidate_info.get('phone', ''),
+        tuple(skills) if tech_stack else (), match_score, tuple(matching_skills)
+    )
+    st.markdown(profile_html, unsafe_allow_html=True)
+
+@st.cache_data(show_spinner=False)
+def _privacy_html() -> str:
+    """Wrap the constant privacy notice in its container markup once."""
+    return f"<div class='privacy-notice'>{PRIVACY_NOTICE}</div>"
 
 def show_privacy_notice() -> bool:
     """Display GDPR-compliant privacy notice and get consent."""
-    st.markdown("<div class='privacy-notice'>", unsafe_allow_html=True)
-    st.markdown(PRIVACY_NOTICE, unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(_privacy_html(), unsafe_allow_html=True)
     
     col1, col2 = st.columns([3, 1])
     with col2:
@@ -211,22 +302,73 @@ def show_privacy_notice() -> bool:
     
     return False
 
+# Prompt for the open-ended phase once screening questions are done. The
+# profile part is fixed after collection, so it is filled in once per candidate.
+_PROFILE_PROMPT_TMPL = Template("""
+            The candidate's name is ${name}.
+            They are applying for a ${position} position.
+            They have ${experience} years of experience.
+            Their skills include: ${tech_stack}.
+            """)
+
+_TURN_PROMPT_TMPL = Template("""
+            Recent conversation:
+            ${context}
+            
+            The candidate just said: "${user_input}"
+            
+            Respond as a professional AI hiring assistant. If they ask about next steps,
+            explain that their profile will be reviewed and they'll be contacted for a follow-up interview if selected.
+            If they want to end the conversation, thank them and confirm the conversation is complete.
+            """)
+
+def _budgeted_context(recent: "deque[str]") -> str:
+    """
+    Join the newest formatted turns that fit within the context budget.
+    
+    Walks backwards from the latest turn and always keeps at least that one,
+    so long replies shrink the window while short exchanges keep more turns.
+    """
+    kept, used = [], 0
+    for turn in reversed(recent):
+        used += len(turn)
+        if kept and used > _CONTEXT_CHAR_BUDGET:
+            break
+        kept.append(turn)
+    return "".join(reversed(kept))
+
+def _format_turn(message: Dict[str, str]) -> str:
+    """Format one message the same way format_chat_history does."""
+    speaker = "User" if message["role"] == "user" else "Assistant"
+    return f"{speaker}: {message['content']}\n\n"
+
 def handle_conversation(user_input: str):
     """
     Advanced conversation handler with state management and validation.
     
+    The reply is written into the caller's current container, streamed
+    token by token in the open-conversation phase.
+    
     Args:
         user_input: The user's input message
     """
     current_state = st.session_state.conversation_state
+    # Part of the response already rendered while streaming
+    shown = ""
+    # Bind the session containers once; they are mutated in place
+    ci = st.session_state.candidate_info
+    ch = st.session_state.chat_history
+    recent = st.session_state.recent_context
     
     # Add user message to chat history
-    st.session_state.chat_history.append({"role": "user", "content": user_input})
+    message = {"role": "user", "content": user_input}
+    ch.append(message)
+    recent.append(_format_turn(message))
     
     # Different behavior based on conversation state
     if current_state == "initial":
         # If this is the first message, assume it's their name
-        st.session_state.candidate_info["name"] = user_input
+        ci["name"] = user_input
         response = f"Nice to meet you, {user_input}! I'm TalentScout, an AI hiring assistant. Could you please provide your email address for our records?"
         st.session_state.conversation_state = "asking_email"
     
@@ -234,7 +376,7 @@ def handle_conversation(user_input: str):
         # Validate and store email
         is_valid, value_or_error = validate_input("email", user_input)
         if is_valid:
-            st.session_state.candidate_info["email"] = value_or_error
+            ci["email"] = value_or_error
             response = "Great! Now, could you please share your phone number?"
             st.session_state.conversation_state = "asking_phone"
         else:
@@ -244,7 +386,7 @@ def handle_conversation(user_input: str):
         # Validate and store phone
         is_valid, value_or_error = validate_input("phone", user_input)
         if is_valid:
-            st.session_state.candidate_info["phone"] = value_or_error
+            ci["phone"] = value_or_error
             response = "Thank you! How many years of professional experience do you have in your field?"
             st.session_state.conversation_state = "asking_experience"
         else:
@@ -254,7 +396,7 @@ def handle_conversation(user_input: str):
         # Validate and store experience
         is_valid, value_or_error = validate_input("experience", user_input)
         if is_valid:
-            st.session_state.candidate_info["experience"] = value_or_error
+            ci["experience"] = value_or_error
             response = "Thanks for sharing your experience. What position are you applying for?"
             st.session_state.conversation_state = "asking_position"
         else:
@@ -262,26 +404,44 @@ def handle_conversation(user_input: str):
     
     elif current_state == "asking_position":
         # Store position
-        st.session_state.candidate_info["position"] = user_input
+        ci["position"] = user_input
         response = "Where are you located or willing to work? (city, remote, etc.)"
         st.session_state.conversation_state = "asking_location"
     
     elif current_state == "asking_location":
         # Store location
-        st.session_state.candidate_info["location"] = user_input
+        ci["location"] = user_input
         response = "Could you list your key technical skills or tech stack? (e.g., Python, React, AWS)"
         st.session_state.conversation_state = "asking_tech_stack"
     
     elif current_state == "asking_tech_stack":
-        # Store tech stack
-        st.session_state.candidate_info["tech_stack"] = user_input
+        # Store tech stack, plus the split skills the profile card renders
+        ci["tech_stack"] = user_input
+        ci["skills_list"] = _SKILL_RE.findall(user_input)
+        
+        # The profile part of the open-conversation prompt is fixed from here on
+        st.session_state.profile_prompt = _PROFILE_PROMPT_TMPL.substitute(
+            name=ci.get('name'),
+            position=ci.get('position'),
+            experience=ci.get('experience'),
+            tech_stack=user_input
+        )
+        
+        # Start generating interview questions in the background so they are
+        # ready by the time the reviewer asks for them
+        st.session_state.questions_future = get_executor().submit(
+            generate_custom_interview_questions,
+            user_input,
+            ci.get('experience', '1-2'),
+            ci.get('position', 'Software Developer')
+        )
         
         # Indicate that we've collected all required information
         st.session_state.collection_complete = True
         
         # Craft a personalized response based on collected information
-        name = st.session_state.candidate_info.get("name", "")
-        position = st.session_state.candidate_info.get("position", "the position")
+        name = ci.get("name", "")
+        position = ci.get("position", "the position")
         
         response = f"Thank you, {name}! We've completed the initial screening for {position}. "
         response += "I've prepared a summary of your profile, and our team will review your information. "
@@ -293,39 +453,18 @@ def handle_conversation(user_input: str):
     elif current_state == "open_conversation":
         # Use the API for open-ended conversation
         if st.session_state.api_status:
-            conversation_context = format_chat_history(st.session_state.chat_history[-5:])
-            prompt = f"""
-            The candidate's name is {st.session_state.candidate_info.get('name')}.
-            They are applying for a {st.session_state.candidate_info.get('position')} position.
-            They have {st.session_state.candidate_info.get('experience')} years of experience.
-            Their skills include: {st.session_state.candidate_info.get('tech_stack')}.
+            prompt = st.session_state.profile_prompt + _TURN_PROMPT_TMPL.substitute(
+                context=_budgeted_context(recent),
+                user_input=user_input
+            )
             
-            Recent conversation:
-            {conversation_context}
-            
-            The candidate just said: "{user_input}"
-            
-            Respond as a professional AI hiring assistant. If they ask about next steps,
-            explain that their profile will be reviewed and they'll be contacted for a follow-up interview if selected.
-            If they want to end the conversation, thank them and confirm the conversation is complete.
-            """
-            
-            response = get_full_response(prompt, SYSTEM_PROMPTS["screening"])
+            response = shown = st.write_stream(coalesce_stream(stream_response(prompt, SYSTEM_PROMPTS["screening"])))
         else:
             # Fallback for when API is not available
             response = "Thank you for your question. Your profile has been recorded and will be reviewed by our hiring team. They will contact you if there's a good match for the position."
         
         # Check if the conversation should end
-        end_phrases = [
-            "thank you for your time",
-            "have a great day",
-            "goodbye",
-            "bye",
-            "end",
-            "exit"
-        ]
-        
-        if any(phrase in user_input.lower() for phrase in end_phrases):
+        if _END_RE.search(user_input):
             response += "\n\nThank you for completing this screening. Your profile has been saved, and our team will contact you if there's a match!"
             st.session_state.conversation_ended = True
     
@@ -334,19 +473,169 @@ def handle_conversation(user_input: str):
         response = "I'm sorry, there was an issue with our conversation flow. Could we restart the interview process?"
         st.session_state.conversation_state = "initial"
     
+    # Render whatever wasn't already streamed
+    if response[len(shown):]:
+        st.markdown(response[len(shown):])
+    
     # Add assistant response to chat history
-    st.session_state.chat_history.append({"role": "assistant", "content": response})
+    message = {"role": "assistant", "content": response}
+    ch.append(message)
+    recent.append(_format_turn(message))
+
+@st.fragment
+def _chat_panel():
+    """
+    Chat history, input handling, and completed-interview section.
+    
+    Runs as a fragment so submitting a message only reruns this part of the
+    page. A new turn is drawn below the history as it is handled, so the
+    reply streams in without an extra st.rerun().
+    """
+    # Display chat history
+    chat_container = st.container()
+    with chat_container:
+        if not st.session_state.chat_history:
+            # Use a static greeting to avoid API call on initial load
+            static_greeting = CONVERSATION_TEMPLATES["greeting"]
+            message = {"role": "assistant", "content": static_greeting}
+            st.session_state.chat_history.append(message)
+            st.session_state.recent_context.append(_format_turn(message))
+        
+        # Display chat messages with proper formatting
+        for message in st.session_state.chat_history:
+            if message["role"] == "user":
+                # Candidate replies are plain text, so skip the markdown pipeline
+                st.chat_message("user").text(message["content"])
+            else:
+                # Use markdown for better formatting and word wrapping
+                container = st.chat_message("assistant", avatar="👨‍💼")
+                container.markdown(message["content"], unsafe_allow_html=False)
+    
+    if not st.session_state.conversation_ended:
+        user_input = st.chat_input("Type your message here...")
+        
+        if user_input:
+            # Show the new turn under the history; the reply is written into its bubble
+            with chat_container:
+                st.chat_message("user").text(user_input)
+                with st.chat_message("assistant", avatar="👨‍💼"):
+                    # Process the user input
+                    try:
+                        handle_conversation(user_input)
+                    except Exception as e:
+                        import traceback
+                        traceback.print_exc()
+                        
+                        st.session_state.error_count += 1
+                        error_message = "I apologize, but I encountered a technical issue. Let's continue our conversation."
+                        
+                        if st.session_state.error_count >= 3:
+                            error_message += " If you continue experiencing issues, please try refreshing the page."
+                        
+                        # Show the error and add it to chat history
+                        st.markdown(error_message)
+                        message = {"role": "assistant", "content": error_message}
+                        st.session_state.chat_history.append(message)
+                        st.session_state.recent_context.append(_format_turn(message))
+            
+            # Swap the chat input for the completed-interview section
+            if st.session_state.conversation_ended:
+                st.rerun(scope="fragment")
+    
+    # Completed interview section
+    input_container = st.container()
+    with input_container:
+        if st.session_state.conversation_ended:
+            st.info("Thank you for completing the initial screening. Our hiring team will review your information and contact you soon!")
+            
+            # Display candidate profile
+            if st.session_state.collection_complete:
+                display_candidate_profile(st.session_state.candidate_info)
+            
+            # Export options for completed conversations
+            export_container = st.container()
+            with export_container:
+                st.subheader("Interview Transcript Export")
+                st.markdown("Download the interview transcript in your preferred format:")
+                
+                filename = f"talentscout_interview_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    # Export to CSV
+                    csv_bytes = _csv_bytes(
+                        len(st.session_state.chat_history),
+                        st.session_state.candidate_id,
+                        st.session_state.chat_history,
+                        st.session_state.candidate_info
+                    )
+                    st.download_button(
+                        "Download Interview (CSV)",
+                        data=csv_bytes,
+                        file_name=f"{filename}.csv",
+                        mime="text/csv"
+                    )
+                
+                with col2:
+                    # Export to TXT
+                    txt_bytes = _txt_bytes(
+                        len(st.session_state.chat_history),
+                        st.session_state.candidate_id,
+                        st.session_state.chat_history,
+                        st.session_state.candidate_info
+                    )
+                    st.download_button(
+                        "Download Interview (Text)",
+                        data=txt_bytes,
+                        file_name=f"{filename}.txt",
+                        mime="text/plain"
+                    )
+                
+                # Generate custom interview questions based on candidate's skills
+                if st.session_state.collection_complete and 'tech_stack' in st.session_state.candidate_info:
+                    st.subheader("AI-Powered Interview Questions Generator")
+                    
+                    # Display existing questions if already generated
+                    if st.session_state.custom_questions_generated:
+                        st.markdown(st.session_state.custom_questions)
+                        
+                        # Option to regenerate
+                        if st.button("Generate New Questions"):
+                            st.session_state.custom_questions_generated = False
+                            st.rerun(scope="fragment")
+                    else:
+                        # Button to generate questions
+                        generate_btn = st.button("Generate Custom Interview Questions")
+                        if generate_btn:
+                            # Use the job started when the tech stack came in, the first time round
+                            questions_future = st.session_state.pop("questions_future", None)
+                            if questions_future is not None:
+                                with st.spinner("Generating custom interview questions based on candidate's skills..."):
+                                    questions = questions_future.result()
+                                st.markdown(questions)
+                            else:
+                                # Regenerating: stream the new set into the page as it is written
+                                questions = st.write_stream(coalesce_stream(stream_custom_interview_questions(
+                                    st.session_state.candidate_info.get('tech_stack', ''),
+                                    st.session_state.candidate_info.get('experience', '1-2'),
+                                    st.session_state.candidate_info.get('position', 'Software Developer')
+                                )))
+                            
+                            # Store in session state
+                            st.session_state.custom_questions = questions
+                            st.session_state.custom_questions_generated = True
 
 # Header section with logo
 st.markdown("<div style='display: flex; align-items: center; margin-bottom: 20px;'></div>", unsafe_allow_html=True)
-try:
+logo = _load_logo()
+if logo is not None:
     col1, col2 = st.columns([1, 4])
     with col1:
-        st.image("assets/logo.jpg", width=150)
+        st.image(logo, width=150)
     with col2:
         st.title("TalentScout AI Hiring Assistant")
         st.subheader("Initial Candidate Screening")
-except Exception as e:
+else:
     st.title("TalentScout AI Hiring Assistant")
     st.subheader("Initial Candidate Screening")
 
@@ -363,102 +652,7 @@ with main_container:
             st.rerun()
     
     if st.session_state.privacy_agreed:
-        # Display chat history
-        chat_container = st.container()
-        with chat_container:
-            if not st.session_state.chat_history:
-                # Use a static greeting to avoid API call on initial load
-                static_greeting = CONVERSATION_TEMPLATES["greeting"]
-                st.session_state.chat_history.append({"role": "assistant", "content": static_greeting})
-            
-            # Display chat messages with proper formatting
-            for message in st.session_state.chat_history:
-                if message["role"] == "user":
-                    st.chat_message("user").markdown(message["content"])
-                else:
-                    # Use markdown for better formatting and word wrapping
-                    container = st.chat_message("assistant", avatar="👨‍💼")
-                    container.markdown(message["content"], unsafe_allow_html=False)
-        
-        # User input section
-        input_container = st.container()
-        with input_container:
-            # Process different stages of conversation
-            if st.session_state.conversation_ended:
-                st.info("Thank you for completing the initial screening. Our hiring team will review your information and contact you soon!")
-                
-                # Display candidate profile
-                if st.session_state.collection_complete:
-                    display_candidate_profile(st.session_state.candidate_info)
-                
-                # Export options for completed conversations
-                export_container = st.container()
-                with export_container:
-                    st.subheader("Interview Transcript Export")
-                    st.markdown("Download the interview transcript in your preferred format:")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        # Export to CSV
-                        csv_link = export_chat_history_to_csv(st.session_state.chat_history, st.session_state.candidate_info)
-                        st.markdown(csv_link, unsafe_allow_html=True)
-                    
-                    with col2:
-                        # Export to TXT
-                        txt_link = export_chat_history_to_txt(st.session_state.chat_history, st.session_state.candidate_info)
-                        st.markdown(txt_link, unsafe_allow_html=True)
-                    
-                    # Generate custom interview questions based on candidate's skills
-                    if st.session_state.collection_complete and 'tech_stack' in st.session_state.candidate_info:
-                        st.subheader("AI-Powered Interview Questions Generator")
-                        
-                        # Display existing questions if already generated
-                        if st.session_state.custom_questions_generated:
-                            st.markdown(st.session_state.custom_questions)
-                            
-                            # Option to regenerate
-                            if st.button("Generate New Questions"):
-                                st.session_state.custom_questions_generated = False
-                                st.rerun()
-                        else:
-                            # Button to generate questions
-                            generate_btn = st.button("Generate Custom Interview Questions")
-                            if generate_btn:
-                                with st.spinner("Generating custom interview questions based on candidate's skills..."):
-                                    skills = st.session_state.candidate_info.get('tech_stack', '')
-                                    experience = st.session_state.candidate_info.get('experience', '1-2')
-                                    position = st.session_state.candidate_info.get('position', 'Software Developer')
-                                    
-                                    questions = generate_custom_interview_questions(skills, experience, position)
-                                    
-                                    # Store in session state
-                                    st.session_state.custom_questions = questions
-                                    st.session_state.custom_questions_generated = True
-                                    
-                                    # Show the questions
-                                    st.markdown(questions)
-            else:
-                user_input = st.chat_input("Type your message here...", disabled=st.session_state.conversation_ended)
-                
-                if user_input:
-                    # Process the user input
-                    try:
-                        handle_conversation(user_input)
-                        # Rerun to update UI
-                        st.rerun()
-                    except Exception as e:
-                        import traceback
-                        traceback.print_exc()
-                        
-                        st.session_state.error_count += 1
-                        error_message = "I apologize, but I encountered a technical issue. Let's continue our conversation."
-                        
-                        if st.session_state.error_count >= 3:
-                            error_message += " If you continue experiencing issues, please try refreshing the page."
-                        
-                        # Add error response to chat history
-                        st.session_state.chat_history.append({"role": "assistant", "content": error_message})
-                        st.rerun()
+        _chat_panel()
 
 # Footer section with creator's full name highlighted in blue
 st.markdown("""
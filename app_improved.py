@@ -6,13 +6,16 @@ Created by: Goddati Bhavyasri
 """
 
 import os
-import time
+import re
 import json
-import random
 import streamlit as st
-import base64
 from datetime import datetime
-from typing import Dict, List, Tuple, Any, Optional
+from html import escape
+from pathlib import Path
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional, Iterator
+from uuid import uuid4
 
 # Import custom modules
 from models.llm_service import llm_service
@@ -22,6 +25,12 @@ from utils.security import gdpr_compliance, data_encryption, input_sanitizer
 from config.settings import get_config
 from styles import apply_custom_styles
 
+# Matches individual skill tokens in a free-form tech stack
+_SKILL_RE = re.compile(r'[^,;|\s]+')
+
+# Candidate fields that must be filled before data collection is complete
+_REQUIRED_FIELDS = frozenset(("name", "email", "phone", "experience", "position", "tech_stack"))
+
 # Set page configuration
 st.set_page_config(
     page_title="TalentScout AI Hiring Assistant",
@@ -33,11 +42,11 @@ st.set_page_config(
 # Apply custom styles
 apply_custom_styles()
 
-# Initialize session state variables
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
-if "candidate_info" not in st.session_state:
-    st.session_state.candidate_info = {
+# Session state defaults. Values are factories so every session gets its own
+# mutable objects and the candidate ID is only generated when first needed.
+_SESSION_DEFAULTS = {
+    "chat_history": list,
+    "candidate_info": lambda: {
         "name": "",
         "email": "",
         "phone": "",
@@ -45,24 +54,22 @@ if "candidate_info" not in st.session_state:
         "position": "",
         "location": "",
         "tech_stack": ""
-    }
-if "collection_complete" not in st.session_state:
-    st.session_state.collection_complete = False
-if "conversation_state" not in st.session_state:
-    st.session_state.conversation_state = "initial"
-if "conversation_ended" not in st.session_state:
-    st.session_state.conversation_ended = False
-if "custom_questions" not in st.session_state:
-    st.session_state.custom_questions = ""
-if "custom_questions_generated" not in st.session_state:
-    st.session_state.custom_questions_generated = False
-if "privacy_agreed" not in st.session_state:
-    st.session_state.privacy_agreed = False
-if "candidate_id" not in st.session_state:
+    },
+    "collection_complete": lambda: False,
+    "conversation_state": lambda: "initial",
+    "conversation_ended": lambda: False,
+    "custom_questions": lambda: "",
+    "custom_questions_generated": lambda: False,
+    "privacy_agreed": lambda: False,
     # Generate a unique ID for this candidate session
-    st.session_state.candidate_id = f"candidate_{int(time.time())}_{random.randint(1000, 9999)}"
-if "error_count" not in st.session_state:
-    st.session_state.error_count = 0
+    "candidate_id": lambda: f"candidate_{uuid4().hex[:12]}",
+    "error_count": lambda: 0
+}
+
+# Initialize session state variables
+for key, factory in _SESSION_DEFAULTS.items():
+    if key not in st.session_state:
+        st.session_state[key] = factory()
 
 def get_initials(name: str) -> str:
     """Extract initials from a person's name."""
@@ -81,20 +88,134 @@ def get_initials(name: str) -> str:
         # Multiple names, take first letter of first and last name
         return (parts[0][0] + parts[-1][0]).upper()
 
-def display_candidate_profile(candidate_info: Dict[str, str]):
+# Characters that need escaping before user text goes into card markup
+_HTML_SPECIAL = frozenset("&<>\"'")
+
+def _escape_html(text: str) -> str:
+    """Escape user text for HTML, returning plain strings without copying them."""
+    if _HTML_SPECIAL.isdisjoint(text):
+        return text
+    return escape(text, quote=True)
+
+# Precompiled profile card HTML templates
+_PROFILE_HEADER_TMPL = Template("""
+    <div class='section-title'>Candidate Profile</div>
+    <div class='candidate-profile-card'>
+    <div class='profile-header'>
+        <div class='profile-picture'>${initials}</div>
+        <div class='profile-info'>
+            <div class='profile-name'>${name}</div>
+            <div class='profile-position'>📌 ${position}</div>
+            <div class='profile-location'>📍 ${location}</div>
+        </div>
+    </div>
+    <div class='profile-details'>
+    """)
+
+_DETAIL_ROW_TMPL = Template("""
+    <div class='detail-row'>
+        <div class='detail-label'>${label}</div>
+        <div class='detail-value'>${value}</div>
+    </div>
+    """)
+
+# Match score indicator with animation, followed by placeholder
+# LinkedIn/GitHub profile links since we don't collect them
+_PROFILE_FOOTER_TMPL = Template("""
+    <div class='match-score'>
+        <div class='match-label'>Role Match</div>
+        <div class='match-value'>${match_score}%</div>
+        <div class='match-bar-container'>
+            <div class='match-bar' style='width: ${match_score}%;'></div>
+        </div>
+    </div>
+    <div class='profile-links'>
+        <a href='#' class='profile-link'>
+            <span class='profile-link-icon'>🔗</span> LinkedIn
+        </a>
+        <a href='#' class='profile-link'>
+            <span class='profile-link-icon'>💻</span> GitHub
+        </a>
+    </div>
+    </div>
+    """)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_profile_html(candidate_info_tuple: Tuple[Tuple[str, str], ...], match_score: int,
+                        matching_skills_tuple: Tuple[str, ...]) -> str:
     """
-    Display a rich candidate profile card with avatar, info, and match score.
+    Build the complete candidate profile card HTML.
     
-    Parameters:
-    - candidate_info: Dictionary containing candidate information
+    Takes hashable tuple versions of the candidate info and matching skills so
+    the result can be cached across reruns.
     """
-    # Get candidate information
+    candidate_info = dict(candidate_info_tuple)
     name = candidate_info.get('name', 'Candidate')
     position = candidate_info.get('position', 'Role not specified')
     experience = candidate_info.get('experience', '0')
     location = candidate_info.get('location', 'Location not specified')
     tech_stack = candidate_info.get('tech_stack', '')
     
+    # Profile header with picture/initials and name
+    html = _PROFILE_HEADER_TMPL.substitute(
+        initials=_escape_html(get_initials(name)),
+        name=_escape_html(name),
+        position=_escape_html(position),
+        location=_escape_html(location)
+    )
+    html += _DETAIL_ROW_TMPL.substitute(label="💼 Experience", value=f"{_escape_html(experience)} years")
+    
+    # Display email and phone if available
+    if email := candidate_info.get('email'):
+        # Secure masking of email for display
+        if '@' in email:
+            username, domain = email.split('@')
+            if len(username) > 3:
+                masked_email = f"{username[:3]}{'*' * (len(username)-3)}@{domain}"
+            else:
+                masked_email = f"{'*' * len(username)}@{domain}"
+        else:
+            masked_email = email  # Use as is if it doesn't contain @
+            
+        html += _DETAIL_ROW_TMPL.substitute(label="📧 Email", value=masked_email)
+    
+    if phone := candidate_info.get('phone'):
+        # Secure masking of phone for display
+        if len(phone) > 4:
+            masked_phone = f"{'*' * (len(phone)-4)}{phone[-4:]}"
+        else:
+            masked_phone = phone
+            
+        html += _DETAIL_ROW_TMPL.substitute(label="📱 Phone", value=masked_phone)
+    
+    # End profile details
+    html += "</div>"
+    
+    # Skills section - extract skills from tech_stack and display as tags
+    if tech_stack:
+        # Extract individual skills (split by commas, spaces, etc.)
+        skills = _SKILL_RE.findall(tech_stack)
+        matching_lower = frozenset(s.lower() for s in matching_skills_tuple)
+        
+        # Display skills with improved visualization for matches
+        tags_html = "".join(
+            f"<span class='{'skill-tag match' if skill.lower() in matching_lower else 'skill-tag'}'>{_escape_html(skill)}</span>"
+            for skill in skills
+        )
+        html += f"<div class='skill-tags'>{tags_html}</div>"
+    
+    html += _PROFILE_FOOTER_TMPL.substitute(match_score=match_score)
+    
+    return html
+
+def _evaluate_profile(tech_stack: str, experience: str,
+                      position: str) -> Tuple[int, List[str], Optional[Dict[str, Any]]]:
+    """
+    Score the candidate's skills against the position.
+    
+    Returns:
+        Tuple of (match_score, matching_skills, top_skill_evaluation)
+    """
     # Enhanced role match calculation with explanation
     skill_evaluation = None
     matching_skills = []
@@ -102,7 +223,7 @@ def display_candidate_profile(candidate_info: Dict[str, str]):
     
     if tech_stack and position:
         # Extract individual skills
-        skills = [skill.strip() for skill in tech_stack.replace(',', ' ').split() if skill.strip()]
+        skills = _SKILL_RE.findall(tech_stack)
         
         # Evaluate each skill and calculate average score
         if skills:
@@ -125,182 +246,112 @@ def display_candidate_profile(candidate_info: Dict[str, str]):
     else:
         match_score = 50  # Default value
     
-    # Get candidate initials for avatar
-    initials = get_initials(name)
-    
-    # Create profile card
-    st.markdown("<div class='section-title'>Candidate Profile</div>", unsafe_allow_html=True)
-    st.markdown("<div class='candidate-profile-card'>", unsafe_allow_html=True)
-    
-    # Profile header with picture/initials and name
-    st.markdown(f"""
-    <div class='profile-header'>
-        <div class='profile-picture'>{initials}</div>
-        <div class='profile-info'>
-            <div class='profile-name'>{name}</div>
-            <div class='profile-position'>📌 {position}</div>
-            <div class='profile-location'>📍 {location}</div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Profile details
-    st.markdown("<div class='profile-details'>", unsafe_allow_html=True)
-    
-    # Experience
-    st.markdown(f"""
-    <div class='detail-row'>
-        <div class='detail-label'>💼 Experience</div>
-        <div class='detail-value'>{experience} years</div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Display email and phone if available
-    if candidate_info.get('email'):
-        # Secure masking of email for display
-        email = candidate_info.get('email', '')
-        if '@' in email:
-            username, domain = email.split('@')
-            if len(username) > 3:
-                masked_email = f"{username[:3]}{'*' * (len(username)-3)}@{domain}"
-            else:
-                masked_email = f"{'*' * len(username)}@{domain}"
-        else:
-            masked_email = email  # Use as is if it doesn't contain @
-            
-        st.markdown(f"""
-        <div class='detail-row'>
-            <div class='detail-label'>📧 Email</div>
-            <div class='detail-value'>{masked_email}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    if candidate_info.get('phone'):
-        # Secure masking of phone for display
-        phone = candidate_info.get('phone', '')
-        if len(phone) > 4:
-            masked_phone = f"{'*' * (len(phone)-4)}{phone[-4:]}"
-        else:
-            masked_phone = phone
-            
-        st.markdown(f"""
-        <div class='detail-row'>
-            <div class='detail-label'>📱 Phone</div>
-            <div class='detail-value'>{masked_phone}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    return match_score, matching_skills, skill_evaluation
+
+# Wording for each experience level in the skill assessment
+_EXPERIENCE_DESCRIPTIONS = {
+    "beginner": "early-career level (0-2 years)",
+    "intermediate": "mid-level (2-5 years)",
+    "advanced": "senior level (5+ years)"
+}
+
+# Development suggestions per role track; None covers unrecognized positions
+_DEVELOPMENT_SUGGESTIONS = {
+    "frontend": (
+        "Developing expertise in modern JavaScript frameworks (React, Vue, or Angular)",
+        "Strengthening UI/UX design skills",
+        "Learning state management patterns"
+    ),
+    "backend": (
+        "Enhancing knowledge of API design and implementation",
+        "Developing database optimization skills",
+        "Learning microservices architecture patterns"
+    ),
+    "fullstack": (
+        "Balancing frontend and backend skills",
+        "Learning deployment and DevOps practices",
+        "Developing end-to-end testing strategies"
+    ),
+    None: (
+        "Further specialization in relevant technologies",
+        "Contributing to open-source projects",
+        "Pursuing relevant certifications or advanced training"
+    )
+}
+
+def display_candidate_profile(candidate_info: Dict[str, str]):
+    """
+    Display a rich candidate profile card with avatar, info, and match score.
     
-    # End profile details
-    st.markdown("</div>", unsafe_allow_html=True)
+    Parameters:
+    - candidate_info: Dictionary containing candidate information
+    """
+    # Get candidate information
+    position = candidate_info.get('position', 'Role not specified')
+    experience = candidate_info.get('experience', '0')
+    tech_stack = candidate_info.get('tech_stack', '')
     
-    # Skills section - extract skills from tech_stack and display as tags
-    if tech_stack:
-        # Extract individual skills (split by commas, spaces, etc.)
-        skills = [skill.strip() for skill in tech_stack.replace(',', ' ').split() if skill.strip()]
-        
-        # Display skills with improved visualization for matches
-        st.markdown("<div class='skill-tags'>", unsafe_allow_html=True)
-        for skill in skills:
-            skill_class = "skill-tag match" if skill.lower() in [s.lower() for s in matching_skills] else "skill-tag"
-            st.markdown(f"<span class='{skill_class}'>{skill}</span>", unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
-    
-    # Match score indicator with animation
-    st.markdown(f"""
-    <div class='match-score'>
-        <div class='match-label'>Role Match</div>
-        <div class='match-value'>{match_score}%</div>
-        <div class='match-bar-container'>
-            <div class='match-bar' style='width: {match_score}%;'></div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    # Reuse the previous evaluation while the candidate info is unchanged, so
+    # reruns of the completed-interview screen skip re-scoring every skill
+    profile_hash = hash(frozenset(candidate_info.items()))
+    if st.session_state.get("profile_hash") == profile_hash:
+        match_score, matching_skills, skill_evaluation = st.session_state.profile_evaluation
+    else:
+        match_score, matching_skills, skill_evaluation = _evaluate_profile(tech_stack, experience, position)
+        st.session_state.profile_hash = profile_hash
+        st.session_state.profile_evaluation = (match_score, matching_skills, skill_evaluation)
     
-    # Add LinkedIn/GitHub profile links - these are placeholders since we don't collect them
-    st.markdown("""
-    <div class='profile-links'>
-        <a href='#' class='profile-link'>
-            <span class='profile-link-icon'>🔗</span> LinkedIn
-        </a>
-        <a href='#' class='profile-link'>
-            <span class='profile-link-icon'>💻</span> GitHub
-        </a>
-    </div>
-    """, unsafe_allow_html=True)
+    # Render the whole profile card with a single markdown call
+    profile_html = _build_profile_html(tuple(candidate_info.items()), match_score, tuple(matching_skills))
+    st.markdown(profile_html, unsafe_allow_html=True)
     
     # Expandable content section with match explanation
     if skill_evaluation:
         assessment_expander = st.expander("Skill Assessment")
         with assessment_expander:
-            st.markdown(f"### Key Skill Assessment")
-            st.markdown(f"**{skill_evaluation['skill']}**: {skill_evaluation['recommendation']}")
-            
-            experience_descriptions = {
-                "beginner": "early-career level (0-2 years)",
-                "intermediate": "mid-level (2-5 years)",
-                "advanced": "senior level (5+ years)"
-            }
-            
-            st.markdown(f"Based on the candidate's {experience} years of experience, they have {experience_descriptions.get(skill_evaluation['experience_level'], 'various')} expertise.")
+            # Emit the whole assessment as one markdown block
+            sections = [
+                "### Key Skill Assessment",
+                f"**{skill_evaluation['skill']}**: {skill_evaluation['recommendation']}",
+                f"Based on the candidate's {experience} years of experience, they have "
+                f"{_EXPERIENCE_DESCRIPTIONS.get(skill_evaluation['experience_level'], 'various')} expertise."
+            ]
             
             # Add skill development suggestions
             if skill_evaluation['score'] < 70:
-                st.markdown("### Suggested Areas for Development")
-                st.markdown("To better match this role, the candidate might consider:")
-                
                 # Generate suggestions based on position
                 position_lower = position.lower()
-                if "frontend" in position_lower:
-                    st.markdown("- Developing expertise in modern JavaScript frameworks (React, Vue, or Angular)")
-                    st.markdown("- Strengthening UI/UX design skills")
-                    st.markdown("- Learning state management patterns")
-                elif "backend" in position_lower:
-                    st.markdown("- Enhancing knowledge of API design and implementation")
-                    st.markdown("- Developing database optimization skills")
-                    st.markdown("- Learning microservices architecture patterns")
-                elif "fullstack" in position_lower:
-                    st.markdown("- Balancing frontend and backend skills")
-                    st.markdown("- Learning deployment and DevOps practices")
-                    st.markdown("- Developing end-to-end testing strategies")
-                else:
-                    st.markdown("- Further specialization in relevant technologies")
-                    st.markdown("- Contributing to open-source projects")
-                    st.markdown("- Pursuing relevant certifications or advanced training")
+                track = next((t for t in ("frontend", "backend", "fullstack") if t in position_lower), None)
+                sections.append("### Suggested Areas for Development")
+                sections.append("To better match this role, the candidate might consider:")
+                sections.append("\n".join(f"- {item}" for item in _DEVELOPMENT_SUGGESTIONS[track]))
+            
+            st.markdown("\n\n".join(sections))
     
     # Expandable content section for resume summary
     resume_expander = st.expander("Resume Summary")
     with resume_expander:
         st.markdown("This is a placeholder for the candidate's resume summary, which would typically include a brief overview of their career, key achievements, and professional goals.")
-    
-    # Close profile card
-    st.markdown("</div>", unsafe_allow_html=True)
 
-def export_chat_history_to_csv(chat_history: List[Dict[str, str]], candidate_info: Dict[str, str]) -> str:
-    """
-    Export the chat history to CSV format with enhanced GDPR compliance.
-    
-    Returns:
-        Download link HTML
-    """
-    # Create a StringIO object to store CSV data
-    from io import StringIO
-    import csv
-    
-    csv_string = StringIO()
-    writer = csv.writer(csv_string)
+def _normalized_history(chat_history: List[Dict[str, str]]) -> List[Tuple[str, str]]:
+    """Flatten the chat history into (role_label, content) pairs for the exporters."""
+    return [(message["role"].capitalize(), message["content"]) for message in chat_history]
+
+def _iter_csv_rows(messages: List[Tuple[str, str]], candidate_info: Dict[str, str]) -> Iterator[List[str]]:
+    """Yield the CSV export rows one at a time."""
+    # A single timestamp is used for the header and every row
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     # Add GDPR and privacy information
-    writer.writerow(['TalentScout AI Interview Export (CSV)'])
-    writer.writerow(['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-    writer.writerow(['Data Retention Policy:', '6 months from interview date'])
-    writer.writerow([])
+    yield ['TalentScout AI Interview Export (CSV)']
+    yield ['Generated:', timestamp]
+    yield ['Data Retention Policy:', '6 months from interview date']
+    yield []
     
     # Write the header
-    writer.writerow(['Time', 'Role', 'Content'])
+    yield ['Time', 'Role', 'Content']
     
     # Write the candidate info as the first entry
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
     # Anonymize data for export based on user preference
     candidate_summary = f"Candidate: {candidate_info.get('name', 'N/A')}\n"
     candidate_summary += f"Email: {candidate_info.get('email', 'N/A')}\n"
@@ -310,69 +361,98 @@ def export_chat_history_to_csv(chat_history: List[Dict[str, str]], candidate_inf
     candidate_summary += f"Location: {candidate_info.get('location', 'N/A')}\n"
     candidate_summary += f"Tech Stack: {candidate_info.get('tech_stack', 'N/A')}"
     
-    writer.writerow([timestamp, 'System', candidate_summary])
+    yield [timestamp, 'System', candidate_summary]
     
     # Write each chat message with a timestamp
-    for message in chat_history:
-        writer.writerow([timestamp, message["role"].capitalize(), message["content"]])
+    for role, content in messages:
+        yield [timestamp, role, content]
+
+def _iter_txt_lines(messages: List[Tuple[str, str]], candidate_info: Dict[str, str]) -> Iterator[str]:
+    """Yield the text export one section at a time."""
+    yield f"TalentScout AI Interview - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
     
-    # Get the CSV data as a string
-    csv_data = csv_string.getvalue()
-    csv_string.close()
+    # Add privacy notice
+    yield "DATA PRIVACY NOTICE\n"
+    yield "=================\n"
+    yield "This interview transcript contains personal data protected under GDPR.\n"
+    yield "Data retention period: 6 months from interview date\n"
+    yield "For privacy concerns, contact: privacy@talentscout.ai\n\n"
     
-    # Encode as base64 for download link
-    b64 = base64.b64encode(csv_data.encode()).decode()
+    # Add the candidate info
+    yield "CANDIDATE INFORMATION\n"
+    yield "=====================\n"
+    yield f"Name: {candidate_info.get('name', 'N/A')}\n"
+    yield f"Email: {candidate_info.get('email', 'N/A')}\n"
+    yield f"Phone: {candidate_info.get('phone', 'N/A')}\n"
+    yield f"Experience: {candidate_info.get('experience', 'N/A')} years\n"
+    yield f"Position: {candidate_info.get('position', 'N/A')}\n"
+    yield f"Location: {candidate_info.get('location', 'N/A')}\n"
+    yield f"Tech Stack: {candidate_info.get('tech_stack', 'N/A')}\n\n"
     
-    # Create a download link with improved styling
-    filename = f"talentscout_interview_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    href = f'<a download="{filename}" href="data:text/csv;base64,{b64}" class="download-button">Download Interview (CSV)</a>'
+    # Add the interview conversation
+    yield "INTERVIEW TRANSCRIPT\n"
+    yield "===================\n\n"
     
-    return href
+    candidate_label = f"{candidate_info.get('name', 'Candidate')}:"
+    for role, content in messages:
+        label = "TalentScout AI:" if role == "Assistant" else candidate_label
+        yield f"{label}\n{content}\n\n"
 
-def export_chat_history_to_txt(chat_history: List[Dict[str, str]], candidate_info: Dict[str, str]) -> str:
+def export_chat_history_to_csv(messages: List[Tuple[str, str]], candidate_info: Dict[str, str]) -> bytes:
     """
-    Export the chat history to text format with enhanced GDPR compliance.
+    Export the chat history to CSV format with enhanced GDPR compliance.
+    
+    Takes the (role_label, content) pairs produced by _normalized_history.
+    
+    Rows are streamed straight into a byte buffer, avoiding an intermediate
+    string copy of the whole transcript.
     
     Returns:
-        Download link HTML
+        UTF-8 encoded CSV data
     """
-    # Create a string to store the text data
-    text_content = f"TalentScout AI Interview - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    
-    # Add privacy notice
-    text_content += "DATA PRIVACY NOTICE\n"
-    text_content += "=================\n"
-    text_content += "This interview transcript contains personal data protected under GDPR.\n"
-    text_content += "Data retention period: 6 months from interview date\n"
-    text_content += "For privacy concerns, contact: privacy@talentscout.ai\n\n"
+    from io import BytesIO, TextIOWrapper
+    import csv
     
-    # Add the candidate info
-    text_content += "CANDIDATE INFORMATION\n"
-    text_content += "=====================\n"
-    text_content += f"Name: {candidate_info.get('name', 'N/A')}\n"
-    text_content += f"Email: {candidate_info.get('email', 'N/A')}\n"
-    text_content += f"Phone: {candidate_info.get('phone', 'N/A')}\n"
-    text_content += f"Experience: {candidate_info.get('experience', 'N/A')} years\n"
-    text_content += f"Position: {candidate_info.get('position', 'N/A')}\n"
-    text_content += f"Location: {candidate_info.get('location', 'N/A')}\n"
-    text_content += f"Tech Stack: {candidate_info.get('tech_stack', 'N/A')}\n\n"
+    csv_bytes = BytesIO()
+    csv_text = TextIOWrapper(csv_bytes, encoding='utf-8', newline='', write_through=True)
+    writer = csv.writer(csv_text)
+    writer.writerows(_iter_csv_rows(messages, candidate_info))
+    csv_text.detach()
     
-    # Add the interview conversation
-    text_content += "INTERVIEW TRANSCRIPT\n"
-    text_content += "===================\n\n"
+    return csv_bytes.getvalue()
+
+def export_chat_history_to_txt(messages: List[Tuple[str, str]], candidate_info: Dict[str, str]) -> bytes:
+    """
+    Export the chat history to text format with enhanced GDPR compliance.
     
-    for message in chat_history:
-        role = "TalentScout AI:" if message["role"] == "assistant" else f"{candidate_info.get('name', 'Candidate')}:"
-        text_content += f"{role}\n{message['content']}\n\n"
+    Takes the (role_label, content) pairs produced by _normalized_history.
     
-    # Encode as base64 for download link
-    b64 = base64.b64encode(text_content.encode()).decode()
+    Returns:
+        UTF-8 encoded transcript text
+    """
+    from io import BytesIO
+    import codecs
     
-    # Create a download link with improved styling
-    filename = f"talentscout_interview_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-    href = f'<a download="{filename}" href="data:text/plain;base64,{b64}" class="download-button">Download Interview (Text)</a>'
+    # Encode the transcript incrementally into a byte buffer
+    text_bytes = BytesIO()
+    for chunk in codecs.iterencode(_iter_txt_lines(messages, candidate_info), 'utf-8'):
+        text_bytes.write(chunk)
     
-    return href
+    return text_bytes.getvalue()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_csv_bytes(history_len: int, candidate_id: str,
+                      _chat_history: List[Dict[str, str]], _candidate_info: Dict[str, str]) -> bytes:
+    """CSV export cached per (transcript length, candidate) pair."""
+    messages = _normalized_history(_chat_history)
+    return export_chat_history_to_csv(messages, _candidate_info)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_txt_bytes(history_len: int, candidate_id: str,
+                      _chat_history: List[Dict[str, str]], _candidate_info: Dict[str, str]) -> bytes:
+    """Text export cached per (transcript length, candidate) pair."""
+    messages = _normalized_history(_chat_history)
+    return export_chat_history_to_txt(messages, _candidate_info)
 
 def generate_custom_interview_questions(skills: str, experience_level: str, position: str) -> str:
     """
@@ -383,12 +463,22 @@ def generate_custom_interview_questions(skills: str, experience_level: str, posi
     """
     return skill_assessor.generate_technical_questions(skills, experience_level, position)
 
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide worker pool for background LLM jobs."""
+    return ThreadPoolExecutor(max_workers=4)
+
+@st.cache_resource
+def _privacy_html() -> str:
+    """Build the static privacy notice markup once per process."""
+    return (
+        "<div class='section-title'>Privacy Notice</div>"
+        f"<div class='privacy-notice'>{gdpr_compliance.get_privacy_notice()}</div>"
+    )
+
 def show_privacy_notice():
     """Display GDPR-compliant privacy notice and get consent."""
-    st.markdown("<div class='section-title'>Privacy Notice</div>", unsafe_allow_html=True)
-    st.markdown("<div class='privacy-notice'>", unsafe_allow_html=True)
-    
-    st.markdown(gdpr_compliance.get_privacy_notice(), unsafe_allow_html=True)
+    st.markdown(_privacy_html(), unsafe_allow_html=True)
     
     # Add checkbox for consent
     consent = st.checkbox("I understand and agree to the processing of my personal data as described above.")
@@ -398,21 +488,197 @@ def show_privacy_notice():
         # Log consent for GDPR compliance
         gdpr_compliance.log_consent(st.session_state.candidate_id, datetime.now())
     
-    st.markdown("</div>", unsafe_allow_html=True)
-    
     return consent
 
+@st.fragment
+def chat_fragment():
+    """
+    Chat history, input handling, and completed-interview section.
+    
+    Runs as a fragment so interacting with the chat only reruns this part of
+    the page. The history is drawn first, then the chat input; a new turn is
+    written into the history container, so the reply shows up in the same
+    run without an extra st.rerun().
+    """
+    # Display chat history
+    chat_container = st.container()
+    with chat_container:
+        if not st.session_state.chat_history:
+            # Use a static greeting to avoid API call on initial load
+            static_greeting = "Welcome to TalentScout AI! I'm your hiring assistant, here to help with the initial screening process. To get started, could you please tell me your full name?"
+            st.session_state.chat_history.append({"role": "assistant", "content": static_greeting})
+        
+        # Display chat messages with proper formatting
+        for message in st.session_state.chat_history:
+            if message["role"] == "user":
+                # Candidate replies are plain text, so skip the markdown pipeline
+                st.chat_message("user").text(message["content"])
+            else:
+                # Use markdown for better formatting and word wrapping
+                container = st.chat_message("assistant", avatar="👨‍💼")
+                container.markdown(message["content"], unsafe_allow_html=False)
+    
+    if not st.session_state.conversation_ended:
+        user_input = st.chat_input("Type your message here...")
+        
+        if user_input:
+            # Reset error count on each valid input
+            st.session_state.error_count = 0
+            
+            # Add user message to chat history
+            st.session_state.chat_history.append({"role": "user", "content": user_input})
+            
+            # Show the new turn under the history; the reply is written into its bubble
+            with chat_container:
+                st.chat_message("user").text(user_input)
+                with st.chat_message("assistant", avatar="👨‍💼"):
+                    # Use the conversation manager to handle user message
+                    response, next_state = conversation_manager.handle_user_message(
+                        user_input,
+                        st.session_state.chat_history,
+                        st.session_state.candidate_info,
+                        st.session_state.conversation_state
+                    )
+                    st.markdown(response, unsafe_allow_html=False)
+            
+            # Once the tech stack is known, start generating interview questions
+            # in the background; the completed section collects the result
+            candidate_info = st.session_state.candidate_info
+            if (candidate_info.get('tech_stack') and not st.session_state.custom_questions_generated
+                    and st.session_state.get("questions_future") is None):
+                st.session_state.questions_future = get_executor().submit(
+                    generate_custom_interview_questions,
+                    candidate_info.get('tech_stack', ''),
+                    candidate_info.get('experience', '1-2'),
+                    candidate_info.get('position', 'Software Developer')
+                )
+            
+            # Update conversation state
+            st.session_state.conversation_state = next_state
+            
+            # Check if data collection is complete
+            filled_fields = {field for field, value in st.session_state.candidate_info.items() if value}
+            if _REQUIRED_FIELDS <= filled_fields:
+                st.session_state.collection_complete = True
+            
+            # Check if conversation has ended
+            if next_state == "completion":
+                st.session_state.conversation_ended = True
+            
+            # Add assistant response to chat history
+            st.session_state.chat_history.append({"role": "assistant", "content": response})
+            
+            # Swap the chat input for the completed-interview section
+            if st.session_state.conversation_ended:
+                st.rerun(scope="fragment")
+    
+    # Completed interview section
+    input_container = st.container()
+    with input_container:
+        if st.session_state.conversation_ended:
+            st.info("Thank you for completing the initial screening. Our hiring team will review your information and contact you soon!")
+            
+            # Display candidate profile
+            if st.session_state.collection_complete:
+                display_candidate_profile(st.session_state.candidate_info)
+            
+            # Export options for completed conversations
+            export_container = st.container()
+            with export_container:
+                st.subheader("Interview Transcript Export")
+                st.markdown("Download the interview transcript in your preferred format:")
+                
+                filename = f"talentscout_interview_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    # Export to CSV
+                    csv_bytes = _cached_csv_bytes(
+                        len(st.session_state.chat_history),
+                        st.session_state.candidate_id,
+                        st.session_state.chat_history,
+                        st.session_state.candidate_info
+                    )
+                    st.download_button(
+                        "Download Interview (CSV)",
+                        data=csv_bytes,
+                        file_name=f"{filename}.csv",
+                        mime="text/csv"
+                    )
+                
+                with col2:
+                    # Export to TXT
+                    txt_bytes = _cached_txt_bytes(
+                        len(st.session_state.chat_history),
+                        st.session_state.candidate_id,
+                        st.session_state.chat_history,
+                        st.session_state.candidate_info
+                    )
+                    st.download_button(
+                        "Download Interview (Text)",
+                        data=txt_bytes,
+                        file_name=f"{filename}.txt",
+                        mime="text/plain"
+                    )
+                
+                # Generate custom interview questions based on candidate's skills
+                if st.session_state.collection_complete and 'tech_stack' in st.session_state.candidate_info:
+                    st.subheader("AI-Powered Interview Questions Generator")
+                    
+                    # Wait once on the background job; a failed job falls back to the button
+                    questions_future = st.session_state.get("questions_future")
+                    if questions_future is not None:
+                        st.session_state.questions_future = None
+                        try:
+                            with st.spinner("Generating custom interview questions based on candidate's skills..."):
+                                st.session_state.custom_questions = questions_future.result()
+                            st.session_state.custom_questions_generated = True
+                        except Exception:
+                            st.warning("Could not generate interview questions. Please try again.")
+                    
+                    # Display existing questions if already generated
+                    if st.session_state.custom_questions_generated:
+                        st.markdown(st.session_state.custom_questions)
+                        
+                        # Option to regenerate
+                        if st.button("Generate New Questions"):
+                            st.session_state.custom_questions_generated = False
+                            st.rerun(scope="fragment")
+                    else:
+                        # Button to generate questions
+                        generate_btn = st.button("Generate Custom Interview Questions")
+                        if generate_btn:
+                            skills = st.session_state.candidate_info.get('tech_stack', '')
+                            experience = st.session_state.candidate_info.get('experience', '1-2')
+                            position = st.session_state.candidate_info.get('position', 'Software Developer')
+                            
+                            # Generate questions using improved algorithm on a worker thread
+                            st.session_state.questions_future = get_executor().submit(
+                                generate_custom_interview_questions, skills, experience, position
+                            )
+                            st.rerun(scope="fragment")
+
+_LOGO_PATH = Path("assets/logo.jpg")
+
+@st.cache_data(show_spinner=False)
+def _asset_bytes(path: Path) -> Optional[bytes]:
+    """Read a static asset from disk once, or return None if it is missing."""
+    if not path.is_file():
+        return None
+    return path.read_bytes()
+
 # Header section with logo
 st.markdown("<div class='header-row'></div>", unsafe_allow_html=True)
-try:
+logo = _asset_bytes(_LOGO_PATH)
+if logo is not None:
     col1, col2 = st.columns([1, 4])
     with col1:
         # Add padding and use larger image for better quality
-        st.image("assets/logo.jpg", width=150)
+        st.image(logo, width=150)
     with col2:
         st.title("TalentScout AI Hiring Assistant")
         st.subheader("Initial Candidate Screening")
-except Exception as e:
+else:
     st.title("TalentScout AI Hiring Assistant")
     st.subheader("Initial Candidate Screening")
 
@@ -425,123 +691,7 @@ with main_container:
             st.rerun()
     
     if st.session_state.privacy_agreed:
-        # Display chat history
-        chat_container = st.container()
-        with chat_container:
-            if not st.session_state.chat_history:
-                # Use a static greeting to avoid API call on initial load
-                static_greeting = "Welcome to TalentScout AI! I'm your hiring assistant, here to help with the initial screening process. To get started, could you please tell me your full name?"
-                st.session_state.chat_history.append({"role": "assistant", "content": static_greeting})
-            
-            # Display chat messages with proper formatting
-            for message in st.session_state.chat_history:
-                if message["role"] == "user":
-                    st.chat_message("user").markdown(message["content"])
-                else:
-                    # Use markdown for better formatting and word wrapping
-                    container = st.chat_message("assistant", avatar="👨‍💼")
-                    container.markdown(message["content"], unsafe_allow_html=False)
-        
-        # User input section
-        input_container = st.container()
-        with input_container:
-            # Process different stages of conversation
-            if st.session_state.conversation_ended:
-                st.info("Thank you for completing the initial screening. Our hiring team will review your information and contact you soon!")
-                
-                # Display candidate profile
-                if st.session_state.collection_complete:
-                    display_candidate_profile(st.session_state.candidate_info)
-                
-                # Export options for completed conversations
-                export_container = st.container()
-                with export_container:
-                    st.markdown("<div class='export-container'>", unsafe_allow_html=True)
-                    st.subheader("Interview Transcript Export")
-                    st.markdown("Download the interview transcript in your preferred format:")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        # Export to CSV
-                        csv_link = export_chat_history_to_csv(st.session_state.chat_history, st.session_state.candidate_info)
-                        st.markdown(csv_link, unsafe_allow_html=True)
-                    
-                    with col2:
-                        # Export to TXT
-                        txt_link = export_chat_history_to_txt(st.session_state.chat_history, st.session_state.candidate_info)
-                        st.markdown(txt_link, unsafe_allow_html=True)
-                    
-                    st.markdown("</div>", unsafe_allow_html=True)
-                    
-                    # Generate custom interview questions based on candidate's skills
-                    if st.session_state.collection_complete and 'tech_stack' in st.session_state.candidate_info:
-                        st.markdown("<div class='custom-questions-container'>", unsafe_allow_html=True)
-                        st.subheader("AI-Powered Interview Questions Generator")
-                        
-                        # Display existing questions if already generated
-                        if st.session_state.custom_questions_generated:
-                            st.markdown(st.session_state.custom_questions)
-                            
-                            # Option to regenerate
-                            if st.button("Generate New Questions"):
-                                st.session_state.custom_questions_generated = False
-                                st.rerun()
-                        else:
-                            # Button to generate questions
-                            generate_btn = st.button("Generate Custom Interview Questions")
-                            if generate_btn:
-                                with st.spinner("Generating custom interview questions based on candidate's skills..."):
-                                    skills = st.session_state.candidate_info.get('tech_stack', '')
-                                    experience = st.session_state.candidate_info.get('experience', '1-2')
-                                    position = st.session_state.candidate_info.get('position', 'Software Developer')
-                                    
-                                    # Generate questions using improved algorithm
-                                    questions = generate_custom_interview_questions(skills, experience, position)
-                                    
-                                    # Store in session state
-                                    st.session_state.custom_questions = questions
-                                    st.session_state.custom_questions_generated = True
-                                    
-                                    # Show the questions
-                                    st.markdown(questions)
-                        
-                        st.markdown("</div>", unsafe_allow_html=True)
-            else:
-                user_input = st.chat_input("Type your message here...", disabled=st.session_state.conversation_ended)
-                
-                if user_input:
-                    # Reset error count on each valid input
-                    st.session_state.error_count = 0
-                    
-                    # Add user message to chat history
-                    st.session_state.chat_history.append({"role": "user", "content": user_input})
-                    
-                    # Use the conversation manager to handle user message
-                    response, next_state = conversation_manager.handle_user_message(
-                        user_input, 
-                        st.session_state.chat_history,
-                        st.session_state.candidate_info,
-                        st.session_state.conversation_state
-                    )
-                    
-                    # Update conversation state
-                    st.session_state.conversation_state = next_state
-                    
-                    # Check if data collection is complete
-                    required_fields = ["name", "email", "phone", "experience", "position", "tech_stack"]
-                    if all(field in st.session_state.candidate_info and st.session_state.candidate_info[field] 
-                          for field in required_fields):
-                        st.session_state.collection_complete = True
-                    
-                    # Check if conversation has ended
-                    if next_state == "completion":
-                        st.session_state.conversation_ended = True
-                    
-                    # Add assistant response to chat history
-                    st.session_state.chat_history.append({"role": "assistant", "content": response})
-                    
-                    # Rerun to update UI
-                    st.rerun()
+        chat_fragment()
 
 # Footer section with creator's full name highlighted in blue
 st.markdown("""
@@ -10,6 +10,7 @@ import json
 import logging
 import os
 import time
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
 
@@ -21,6 +22,32 @@ from config.settings import get_config
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Candidate fields collected during screening, in the order they are asked
+_COLLECTION_FIELDS = ("name", "email", "phone", "experience", "position", "location", "tech_stack")
+
+# (field, label, suffix) for the recap shown once collection is complete
+_CONFIRMATION_FIELDS = (
+    ("name", "Name", ""),
+    ("email", "Email", ""),
+    ("phone", "Phone", ""),
+    ("experience", "Experience", " years"),
+    ("position", "Position", ""),
+    ("location", "Location", ""),
+    ("tech_stack", "Tech Stack", "")
+)
+
+def _next_missing_field(candidate_info: Dict[str, str]) -> Optional[str]:
+    """Return the first collection field that is still empty, or None when all are filled."""
+    return next((field for field in _COLLECTION_FIELDS if not candidate_info.get(field)), None)
+
+@lru_cache(maxsize=256)
+def _format_turn(role: str, content: str) -> str:
+    """Format a single message for prompt context, truncating long content."""
+    speaker = "User" if role == "user" else "Assistant"
+    if len(content) > 200:
+        content = content[:197] + "..."
+    return f"{speaker}: {content}\n\n"
+
 class ConversationManager:
     """Advanced conversation management with context awareness and intelligent fallbacks."""
     
@@ -92,17 +119,23 @@ class ConversationManager:
                 r"(.)\1{4,}"      # Repeated character (aaaaa)
             ]
         }
+        
+        # Compile the intent patterns once, keeping their priority order
+        self._intent_regexes = [
+            (intent, re.compile(pattern))
+            for intent, patterns in self.intent_patterns.items()
+            for pattern in patterns
+        ]
     
     def detect_intent(self, user_input: str) -> str:
         """Detect user intent from input text."""
         sanitized_input = input_sanitizer.sanitize_input(user_input)
         
         # Check against intent patterns
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, sanitized_input):
-                    logger.info(f"Detected intent: {intent} from input: {sanitized_input[:20]}...")
-                    return intent
+        for intent, regex in self._intent_regexes:
+            if regex.search(sanitized_input):
+                logger.info(f"Detected intent: {intent} from input: {sanitized_input[:20]}...")
+                return intent
         
         return "unknown"
     
@@ -133,24 +166,24 @@ class ConversationManager:
         
         # Data collection state: move through fields sequentially
         if current_state == "data_collection":
-            fields = ["name", "email", "phone", "experience", "position", "location", "tech_stack"]
-            
             # Find the first missing field
-            for field in fields:
-                if field not in candidate_info or not candidate_info[field]:
-                    # Get the prompt for this field
-                    prompt = self.field_prompts[field]
-                    # Format with available info
-                    if "{name}" in prompt and "name" in candidate_info:
-                        prompt = prompt.format(name=candidate_info["name"])
-                    return current_state, prompt
+            field = _next_missing_field(candidate_info)
+            if field:
+                # Get the prompt for this field
+                prompt = self.field_prompts[field]
+                # Format with available info
+                if "{name}" in prompt and "name" in candidate_info:
+                    prompt = prompt.format(name=candidate_info["name"])
+                return current_state, prompt
             
             # If all fields are complete, move to technical assessment
             if all_required_complete:
-                confirmation = f"Thank you for your information. I have: Name: {candidate_info['name']}, Email: {candidate_info['email']}, Phone: {candidate_info['phone']}, Experience: {candidate_info['experience']} years, Position: {candidate_info['position']}"
-                if "location" in candidate_info:
-                    confirmation += f", Location: {candidate_info['location']}"
-                confirmation += f", Tech Stack: {candidate_info['tech_stack']}. Now I'll ask a few technical questions."
+                details = ", ".join(
+                    f"{label}: {candidate_info[field]}{suffix}"
+                    for field, label, suffix in _CONFIRMATION_FIELDS
+                    if field in candidate_info
+                )
+                confirmation = f"Thank you for your information. I have: {details}. Now I'll ask a few technical questions."
                 
                 return "technical_assessment", confirmation
         
@@ -189,19 +222,9 @@ class ConversationManager:
     
     def format_chat_history(self, messages: List[Dict[str, str]], max_context: int = 10) -> str:
         """Format chat history for prompt context with truncation."""
-        # Take only the most recent messages to avoid context overflow
-        recent_messages = messages[-max_context:] if len(messages) > max_context else messages
-        
-        formatted = ""
-        for msg in recent_messages:
-            speaker = "User" if msg["role"] == "user" else "Assistant"
-            # Truncate very long messages
-            content = msg["content"]
-            if len(content) > 200:
-                content = content[:197] + "..."
-            formatted += f"{speaker}: {content}\n\n"
-        
-        return formatted
+        # Take only the most recent messages to avoid context overflow; the
+        # window slides by one turn per message, so most lines are cache hits
+        return "".join(_format_turn(msg["role"], msg["content"]) for msg in messages[-max_context:])
     
     def handle_user_message(self, user_message: str, chat_history: List[Dict[str, str]], 
                            candidate_info: Dict[str, str], current_state: str) -> Tuple[str, str]:
@@ -225,13 +248,7 @@ class ConversationManager:
         # If in data collection, handle field-specific validation
         if current_state == "data_collection":
             # Determine which field we're collecting
-            fields = ["name", "email", "phone", "experience", "position", "location", "tech_stack"]
-            current_field = None
-            
-            for field in fields:
-                if field not in candidate_info or not candidate_info[field]:
-                    current_field = field
-                    break
+            current_field = _next_missing_field(candidate_info)
             
             if current_field:
                 # Validate the input for this field
@@ -296,13 +313,8 @@ class ConversationManager:
             return f"Hi {name}, I didn't quite understand that. I'm TalentScout AI, your hiring assistant. To get started with the screening process, could you please tell me your full name?"
         
         elif current_state == "data_collection":
-            fields = ["name", "email", "phone", "experience", "position", "location", "tech_stack"]
             # Find which field we're currently collecting
-            current_field = None
-            for field in fields:
-                if field not in candidate_info or not candidate_info[field]:
-                    current_field = field
-                    break
+            current_field = _next_missing_field(candidate_info)
             
             if current_field:
                 field_descriptions = {
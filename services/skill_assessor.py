@@ -20,6 +20,46 @@ from config.settings import get_config
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Separators between skills in free-text tech stacks
+_SKILL_SPLIT_RE = re.compile(r'[,;/\s]+')
+
+# Generic questions that can be adapted to any skill, by experience level
+_FALLBACK_QUESTIONS = {
+    "beginner": (
+        "Describe your experience with {skill} and what you've built with it so far.",
+        "What are the fundamental concepts of {skill} that you're familiar with?",
+        "How have you approached learning {skill} and what resources have you found most helpful?"
+    ),
+    "intermediate": (
+        "What challenges have you overcome while working with {skill} in a professional context?",
+        "How do you stay updated with best practices and new developments in {skill}?",
+        "Describe a complex problem you solved using {skill} and your approach to it."
+    ),
+    "advanced": (
+        "How have you optimized or improved {skill} implementations in previous roles?",
+        "Describe your approach to mentoring junior developers in {skill}.",
+        "What architectural decisions have you made around {skill} and what were the trade-offs?"
+    )
+}
+
+# Skill relevance to common roles
+_ROLE_SKILLS = {
+    "frontend": frozenset(("javascript", "typescript", "react", "vue", "angular", "html", "css", "responsive", "ui/ux")),
+    "backend": frozenset(("java", "python", "c#", "node.js", "php", "go", "rust", "sql", "nosql", "api")),
+    "fullstack": frozenset(("javascript", "python", "java", "node.js", "react", "angular", "vue", "sql", "nosql")),
+    "devops": frozenset(("docker", "kubernetes", "jenkins", "github actions", "aws", "azure", "gcp", "linux", "ci/cd")),
+    "data": frozenset(("python", "r", "sql", "nosql", "pandas", "hadoop", "spark", "etl", "tableau", "power bi")),
+    "mobile": frozenset(("android", "ios", "swift", "kotlin", "react native", "flutter")),
+    "machine learning": frozenset(("python", "tensorflow", "pytorch", "scikit-learn", "nlp", "computer vision"))
+}
+
+# Score multipliers by experience level
+_EXPERIENCE_MULTIPLIERS = {
+    "beginner": 0.8,
+    "intermediate": 1.0,
+    "advanced": 1.2
+}
+
 class TechnicalAssessor:
     """Advanced technical skill assessment service."""
     
@@ -68,12 +108,9 @@ class TechnicalAssessor:
         if not skills_text:
             return []
             
-        # Extract individual skills from text
-        skill_list = re.split(r'[,;/\s]+', skills_text)
-        skill_list = [s.strip().lower() for s in skill_list if s.strip()]
-        
-        # Deduplicate skills
-        skill_list = list(set(skill_list))
+        # Extract individual, deduplicated skills from text; the split already
+        # consumes all whitespace, so only empty pieces need dropping
+        skill_list = list({s.lower() for s in _SKILL_SPLIT_RE.split(skills_text) if s})
         
         # Categorize each skill
         categorized_skills = []
@@ -190,30 +227,11 @@ Format your response as a numbered list with only the questions, nothing else.
     
     def _get_fallback_questions(self, skill: str, experience_level: str) -> List[str]:
         """Generate fallback questions when the database and LLM fail."""
-        # Generic questions that can be adapted to any skill
-        fallbacks = {
-            "beginner": [
-                f"Describe your experience with {skill} and what you've built with it so far.",
-                f"What are the fundamental concepts of {skill} that you're familiar with?",
-                f"How have you approached learning {skill} and what resources have you found most helpful?"
-            ],
-            "intermediate": [
-                f"What challenges have you overcome while working with {skill} in a professional context?",
-                f"How do you stay updated with best practices and new developments in {skill}?",
-                f"Describe a complex problem you solved using {skill} and your approach to it."
-            ],
-            "advanced": [
-                f"How have you optimized or improved {skill} implementations in previous roles?",
-                f"Describe your approach to mentoring junior developers in {skill}.",
-                f"What architectural decisions have you made around {skill} and what were the trade-offs?"
-            ]
-        }
-        
         # Get questions for the specified level, or intermediate as fallback
-        questions = fallbacks.get(experience_level, fallbacks["intermediate"])
+        questions = _FALLBACK_QUESTIONS.get(experience_level, _FALLBACK_QUESTIONS["intermediate"])
         
-        # Return a subset of questions
-        return random.sample(questions, min(2, len(questions)))
+        # Return a subset of questions, filling in the skill only for those picked
+        return [q.format(skill=skill) for q in random.sample(questions, min(2, len(questions)))]
     
     def generate_technical_questions(self, skills: str, experience: str, position: str) -> str:
         """Generate tailored technical questions based on candidate profile."""
@@ -299,22 +317,11 @@ Format your response as a numbered list with only the questions, nothing else.
         # Set up skill matching for common positions
         position_lower = position.lower()
         
-        # Define skill relevance to common roles
-        role_skills = {
-            "frontend": ["javascript", "typescript", "react", "vue", "angular", "html", "css", "responsive", "ui/ux"],
-            "backend": ["java", "python", "c#", "node.js", "php", "go", "rust", "sql", "nosql", "api"],
-            "fullstack": ["javascript", "python", "java", "node.js", "react", "angular", "vue", "sql", "nosql"],
-            "devops": ["docker", "kubernetes", "jenkins", "github actions", "aws", "azure", "gcp", "linux", "ci/cd"],
-            "data": ["python", "r", "sql", "nosql", "pandas", "hadoop", "spark", "etl", "tableau", "power bi"],
-            "mobile": ["android", "ios", "swift", "kotlin", "react native", "flutter"],
-            "machine learning": ["python", "tensorflow", "pytorch", "scikit-learn", "nlp", "computer vision"]
-        }
-        
         # Figure out which role this position most closely matches
         matched_role = None
         max_match = 0
         
-        for role, keywords in role_skills.items():
+        for role, keywords in _ROLE_SKILLS.items():
             match_score = 0
             for keyword in keywords:
                 if keyword in position_lower:
@@ -333,7 +340,7 @@ Format your response as a numbered list with only the questions, nothing else.
             return evaluation
         
         # Calculate relevance score based on role match
-        relevant_skills = role_skills[matched_role]
+        relevant_skills = _ROLE_SKILLS[matched_role]
         skill_lower = skill.lower()
         
         # Direct match
@@ -363,11 +370,7 @@ Format your response as a numbered list with only the questions, nothing else.
             evaluation["recommendation"] = f"{skill} appears to be outside the core requirements for this {matched_role} role, but may indicate breadth of knowledge."
         
         # Consider experience level in the final score
-        experience_multiplier = {
-            "beginner": 0.8,
-            "intermediate": 1.0,
-            "advanced": 1.2
-        }.get(evaluation["experience_level"], 1.0)
+        experience_multiplier = _EXPERIENCE_MULTIPLIERS.get(evaluation["experience_level"], 1.0)
         
         # Adjust score based on experience (more experienced candidates get slightly higher scores)
         adjusted_score = int(evaluation["score"] * experience_multiplier)
@@ -28,6 +28,18 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Sanitization and validation patterns, compiled once at import
+_SCRIPT_TAG_RE = re.compile(r'<script.*?>.*?</script>', re.DOTALL | re.IGNORECASE)
+_JS_URL_TAG_RE = re.compile(r'<.*?javascript:.*?>', re.DOTALL | re.IGNORECASE)
+_EVENT_HANDLER_RE = re.compile(r'on\w+=".*?"', re.DOTALL | re.IGNORECASE)
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_FORMATTING_RE = re.compile(r'[\s\(\)\-\.]')
+_NON_NUMERIC_RE = re.compile(r'[^\d\.]')
+
+# Candidate fields grouped for GDPR data exports
+_PERSONAL_FIELDS = frozenset(("name", "email", "phone", "location"))
+_PROFESSIONAL_FIELDS = frozenset(("experience", "position", "tech_stack"))
+
 class GDPRCompliance:
     """GDPR compliance utilities for handling candidate data."""
 
@@ -127,11 +139,11 @@ class GDPRCompliance:
         export_data = {
             "personal_data": {
                 key: value for key, value in candidate_data.items() 
-                if key in ["name", "email", "phone", "location"]
+                if key in _PERSONAL_FIELDS
             },
             "professional_data": {
                 key: value for key, value in candidate_data.items()
-                if key in ["experience", "position", "tech_stack"]
+                if key in _PROFESSIONAL_FIELDS
             },
             "chat_history": chat_history,
             "export_date": datetime.now().isoformat(),
@@ -219,9 +231,9 @@ class InputSanitizer:
             input_text = str(input_text)
             
         # Basic XSS prevention - remove script tags and other potentially harmful elements
-        sanitized = re.sub(r'<script.*?>.*?</script>', '', input_text, flags=re.DOTALL | re.IGNORECASE)
-        sanitized = re.sub(r'<.*?javascript:.*?>', '', sanitized, flags=re.DOTALL | re.IGNORECASE)
-        sanitized = re.sub(r'on\w+=".*?"', '', sanitized, flags=re.DOTALL | re.IGNORECASE)
+        sanitized = _SCRIPT_TAG_RE.sub('', input_text)
+        sanitized = _JS_URL_TAG_RE.sub('', sanitized)
+        sanitized = _EVENT_HANDLER_RE.sub('', sanitized)
         
         # Truncate very long inputs
         max_length = 1000  # Reasonable limit for user input
@@ -234,14 +246,13 @@ class InputSanitizer:
     def validate_email(email: str) -> bool:
         """Validate email format."""
         # Simple email validation pattern
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(email_pattern, email))
+        return bool(_EMAIL_RE.match(email))
     
     @staticmethod
     def validate_phone(phone: str) -> bool:
         """Validate phone number format."""
         # Allow various phone formats: (123) 456-7890, 123-456-7890, 123.456.7890, etc.
-        phone = re.sub(r'[\s\(\)\-\.]', '', phone)  # Remove formatting
+        phone = _PHONE_FORMATTING_RE.sub('', phone)  # Remove formatting
         # Check if it contains only digits and has a reasonable length
         return phone.isdigit() and 7 <= len(phone) <= 15
     
@@ -266,7 +277,7 @@ class InputSanitizer:
         elif field == "experience":
             # Try to extract a numeric value
             # Remove non-numeric characters, except decimal point
-            numeric_value = re.sub(r'[^\d\.]', '', sanitized)
+            numeric_value = _NON_NUMERIC_RE.sub('', sanitized)
             
             try:
                 # Try to convert to float
@@ -7,9 +7,9 @@ import re
 import json
 import random
 import logging
-import base64
 from datetime import datetime
-from typing import Tuple, List, Dict, Any
+from functools import lru_cache
+from typing import Tuple, List, Dict, Any, Iterable, Iterator
 
 # Import prompts
 from prompts import FALLBACK_RESPONSES, SYSTEM_PROMPTS
@@ -18,6 +18,23 @@ from prompts import FALLBACK_RESPONSES, SYSTEM_PROMPTS
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Validation patterns, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_NON_DIGIT_RE = re.compile(r'\D')
+_NON_NUMERIC_RE = re.compile(r'[^\d\.]')
+_SKILL_SPLIT_RE = re.compile(r'[,;\s]+')
+
+# Skill relevance to common roles, used for role match scoring
+_ROLE_SKILLS = {
+    "frontend": ("javascript", "typescript", "react", "vue", "angular", "html", "css", "responsive", "ui/ux", "frontend"),
+    "backend": ("java", "python", "c#", "node.js", "php", "go", "rust", "sql", "nosql", "api", "backend"),
+    "fullstack": ("javascript", "python", "java", "node.js", "react", "angular", "vue", "sql", "nosql", "fullstack"),
+    "devops": ("docker", "kubernetes", "jenkins", "github actions", "aws", "azure", "gcp", "linux", "ci/cd", "devops"),
+    "data": ("python", "r", "sql", "nosql", "pandas", "hadoop", "spark", "etl", "tableau", "power bi", "data"),
+    "mobile": ("android", "ios", "swift", "kotlin", "react native", "flutter", "mobile"),
+    "machine learning": ("python", "tensorflow", "pytorch", "scikit-learn", "nlp", "computer vision", "ml", "ai")
+}
+
 def validate_input(field: str, value: str) -> Tuple[bool, str]:
     """
     Validate user input based on field type.
@@ -34,15 +51,14 @@ def validate_input(field: str, value: str) -> Tuple[bool, str]:
     
     # Email validation
     if field == "email":
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, value):
+        if not _EMAIL_RE.match(value):
             return False, "Please provide a valid email address (e.g., name@example.com)."
         return True, value
     
     # Phone validation
     elif field == "phone":
         # Remove non-digit characters for validation
-        digits = re.sub(r'\D', '', value)
+        digits = _NON_DIGIT_RE.sub('', value)
         if len(digits) < 7 or len(digits) > 15:
             return False, "Please provide a valid phone number (e.g., 123-456-7890)."
         return True, value
@@ -51,7 +67,7 @@ def validate_input(field: str, value: str) -> Tuple[bool, str]:
     elif field == "experience":
         try:
             # Try to extract a number
-            numeric_value = re.sub(r'[^\d\.]', '', value)
+            numeric_value = _NON_NUMERIC_RE.sub('', value)
             experience = float(numeric_value)
             if experience < 0 or experience > 100:
                 return False, "Please provide a valid number of years of experience."
@@ -72,12 +88,22 @@ def format_chat_history(messages: List[Dict[str, str]]) -> str:
     Returns:
         Formatted chat history as a string
     """
-    formatted = ""
-    for msg in messages:
-        speaker = "User" if msg["role"] == "user" else "Assistant"
-        content = msg["content"]
-        formatted += f"{speaker}: {content}\n\n"
-    return formatted
+    return "".join(
+        f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}\n\n"
+        for msg in messages
+    )
+
+@lru_cache(maxsize=4)
+def _groq_client(api_key: str):
+    """
+    Return a shared Groq client for the given API key.
+    
+    Reusing one client keeps its HTTP connection pool warm, so later calls
+    skip the TCP/TLS handshake.
+    """
+    import groq
+    
+    return groq.Client(api_key=api_key)
 
 def get_full_response(prompt: str, system_prompt: str = None) -> str:
     """
@@ -92,11 +118,10 @@ def get_full_response(prompt: str, system_prompt: str = None) -> str:
     """
     import os
     import time
-    import groq
     
     try:
         # Try to use Groq API
-        client = groq.Client(api_key=os.environ.get("GROQ_API_KEY", ""))
+        client = _groq_client(os.environ.get("GROQ_API_KEY", ""))
         
         # Add system role for better context
         system_message = system_prompt or SYSTEM_PROMPTS["screening"]
@@ -137,7 +162,89 @@ def get_full_response(prompt: str, system_prompt: str = None) -> str:
         # Return a fallback response from predefined options
         return random.choice(FALLBACK_RESPONSES)
 
-def export_chat_history_to_csv(chat_history: List[Dict[str, str]], candidate_info: Dict[str, str]) -> str:
+def stream_response(prompt: str, system_prompt: str = None) -> Iterator[str]:
+    """
+    Stream a response from the Groq LLM API as it is generated.
+    
+    Args:
+        prompt: The prompt to send to the LLM
+        system_prompt: Optional system prompt to use
+        
+    Yields:
+        Text chunks of the response. If the stream fails before any text
+        arrives, falls back to get_full_response with its retries; if it
+        fails midway, ends with a short notice and a fallback response.
+    """
+    import os
+    
+    started = False
+    try:
+        client = _groq_client(os.environ.get("GROQ_API_KEY", ""))
+        
+        # Add system role for better context
+        system_message = system_prompt or SYSTEM_PROMPTS["screening"]
+        
+        stream = client.chat.completions.create(
+            model="llama3-70b-8192",
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=300,
+            stream=True
+        )
+        
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                started = True
+                yield delta
+    
+    except Exception as e:
+        logger.error(f"Error streaming response from Groq: {str(e)}")
+        
+        # Nothing shown yet, so the blocking path can still retry or fall back
+        if not started:
+            yield get_full_response(prompt, system_prompt)
+        else:
+            # Mark the cut-off so the transcript doesn't record a truncated answer as complete
+            yield "\n\n*(Response interrupted.)* " + random.choice(FALLBACK_RESPONSES)
+
+def coalesce_stream(chunks: Iterable[str], interval: float = 0.05, min_chars: int = 8) -> Iterator[str]:
+    """
+    Group streamed text chunks so the UI repaints at most about 20 times a second.
+    
+    Args:
+        chunks: Text chunks as they arrive from the LLM
+        interval: Minimum seconds between yielded batches
+        min_chars: Minimum characters to accumulate before yielding
+        
+    Yields:
+        Concatenated batches of chunks; whatever is pending is flushed at the end.
+    """
+    import time
+    
+    pending = []
+    pending_chars = 0
+    last_emit = time.monotonic()
+    
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_chars += len(chunk)
+        
+        now = time.monotonic()
+        if now - last_emit >= interval and pending_chars >= min_chars:
+            yield "".join(pending)
+            pending.clear()
+            pending_chars = 0
+            last_emit = now
+    
+    # Always flush the tail of the stream
+    if pending:
+        yield "".join(pending)
+
+def export_chat_history_to_csv(chat_history: List[Dict[str, str]], candidate_info: Dict[str, str]) -> bytes:
     """
     Export the chat history to CSV format.
     
@@ -146,7 +253,7 @@ def export_chat_history_to_csv(chat_history: List[Dict[str, str]], candidate_inf
         candidate_info: Dictionary containing candidate information
         
     Returns:
-        HTML string containing download link
+        UTF-8 encoded CSV data
     """
     from io import StringIO
     import csv
@@ -154,9 +261,12 @@ def export_chat_history_to_csv(chat_history: List[Dict[str, str]], candidate_inf
     csv_string = StringIO()
     writer = csv.writer(csv_string)
     
+    # Take a single timestamp for the header and rows
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
     # Add header information
     writer.writerow(['TalentScout AI Interview Export (CSV)'])
-    writer.writerow(['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
+    writer.writerow(['Generated:', timestamp])
     writer.writerow(['Data Retention Policy:', '6 months from interview date'])
     writer.writerow([])
     
@@ -164,8 +274,6 @@ def export_chat_history_to_csv(chat_history: List[Dict[str, str]], candidate_inf
     writer.writerow(['Time', 'Role', 'Content'])
     
     # Write the candidate info as the first entry
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
     candidate_summary = f"Candidate: {candidate_info.get('name', 'N/A')}\n"
     candidate_summary += f"Email: {candidate_info.get('email', 'N/A')}\n"
     candidate_summary += f"Phone: {candidate_info.get('phone', 'N/A')}\n"
@@ -184,16 +292,9 @@ def export_chat_history_to_csv(chat_history: List[Dict[str, str]], candidate_inf
     csv_data = csv_string.getvalue()
     csv_string.close()
     
-    # Encode as base64 for download link
-    b64 = base64.b64encode(csv_data.encode()).decode()
-    
-    # Create a download link with proper styling
-    filename = f"talentscout_interview_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    href = f'<a href="data:text/csv;base64,{b64}" download="{filename}" class="download-button">Download Interview (CSV)</a>'
-    
-    return href
+    return csv_data.encode()
 
-def export_chat_history_to_txt(chat_history: List[Dict[str, str]], candidate_info: Dict[str, str]) -> str:
+def export_chat_history_to_txt(chat_history: List[Dict[str, str]], candidate_info: Dict[str, str]) -> bytes:
     """
     Export the chat history to text format.
     
@@ -202,46 +303,46 @@ def export_chat_history_to_txt(chat_history: List[Dict[str, str]], candidate_inf
         candidate_info: Dictionary containing candidate information
         
     Returns:
-        HTML string containing download link
+        UTF-8 encoded transcript text
     """
-    # Create a string to store the text data
-    text_content = f"TalentScout AI Interview - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    
-    # Add privacy notice
-    text_content += "DATA PRIVACY NOTICE\n"
-    text_content += "=================\n"
-    text_content += "This interview transcript contains personal data protected under GDPR.\n"
-    text_content += "Data retention period: 6 months from interview date\n"
-    text_content += "For privacy concerns, contact: privacy@talentscout.ai\n\n"
-    
-    # Add the candidate info
-    text_content += "CANDIDATE INFORMATION\n"
-    text_content += "=====================\n"
-    text_content += f"Name: {candidate_info.get('name', 'N/A')}\n"
-    text_content += f"Email: {candidate_info.get('email', 'N/A')}\n"
-    text_content += f"Phone: {candidate_info.get('phone', 'N/A')}\n"
-    text_content += f"Experience: {candidate_info.get('experience', 'N/A')} years\n"
-    text_content += f"Position: {candidate_info.get('position', 'N/A')}\n"
-    text_content += f"Location: {candidate_info.get('location', 'N/A')}\n"
-    text_content += f"Tech Stack: {candidate_info.get('tech_stack', 'N/A')}\n\n"
-    
-    # Add the interview conversation
-    text_content += "INTERVIEW TRANSCRIPT\n"
-    text_content += "===================\n\n"
-    
+    # Collect the text data as a list of lines and join once at the end
+    parts = [
+        f"TalentScout AI Interview - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        # Add privacy notice
+        "DATA PRIVACY NOTICE",
+        "=================",
+        "This interview transcript contains personal data protected under GDPR.",
+        "Data retention period: 6 months from interview date",
+        "For privacy concerns, contact: privacy@talentscout.ai",
+        "",
+        # Add the candidate info
+        "CANDIDATE INFORMATION",
+        "=====================",
+        f"Name: {candidate_info.get('name', 'N/A')}",
+        f"Email: {candidate_info.get('email', 'N/A')}",
+        f"Phone: {candidate_info.get('phone', 'N/A')}",
+        f"Experience: {candidate_info.get('experience', 'N/A')} years",
+        f"Position: {candidate_info.get('position', 'N/A')}",
+        f"Location: {candidate_info.get('location', 'N/A')}",
+        f"Tech Stack: {candidate_info.get('tech_stack', 'N/A')}",
+        "",
+        # Add the interview conversation
+        "INTERVIEW TRANSCRIPT",
+        "===================",
+        "",
+    ]
+    
+    candidate_label = f"{candidate_info.get('name', 'Candidate')}:"
     for message in chat_history:
-        role = "TalentScout AI:" if message["role"] == "assistant" else f"{candidate_info.get('name', 'Candidate')}:"
-        text_content += f"{role}\n{message['content']}\n\n"
+        role = "TalentScout AI:" if message["role"] == "assistant" else candidate_label
+        parts.append(f"{role}\n{message['content']}\n")
     
-    # Encode as base64 for download link
-    b64 = base64.b64encode(text_content.encode()).decode()
+    text_content = "\n".join(parts) + "\n"
     
-    # Create a download link with proper styling
-    filename = f"talentscout_interview_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-    href = f'<a href="data:text/plain;base64,{b64}" download="{filename}" class="download-button">Download Interview (Text)</a>'
-    
-    return href
+    return text_content.encode()
 
+@lru_cache(maxsize=256)
 def get_initials(name: str) -> str:
     """
     Extract initials from a person's name.
@@ -280,25 +381,14 @@ def calculate_role_match(skills: str, experience: str, position: str) -> Tuple[i
         Tuple of (score, matching_skills)
     """
     # Parse skills list
-    skill_list = [s.strip().lower() for s in re.split(r'[,;\s]+', skills) if s.strip()]
-    
-    # Define skill relevance to common roles
-    role_skills = {
-        "frontend": ["javascript", "typescript", "react", "vue", "angular", "html", "css", "responsive", "ui/ux", "frontend"],
-        "backend": ["java", "python", "c#", "node.js", "php", "go", "rust", "sql", "nosql", "api", "backend"],
-        "fullstack": ["javascript", "python", "java", "node.js", "react", "angular", "vue", "sql", "nosql", "fullstack"],
-        "devops": ["docker", "kubernetes", "jenkins", "github actions", "aws", "azure", "gcp", "linux", "ci/cd", "devops"],
-        "data": ["python", "r", "sql", "nosql", "pandas", "hadoop", "spark", "etl", "tableau", "power bi", "data"],
-        "mobile": ["android", "ios", "swift", "kotlin", "react native", "flutter", "mobile"],
-        "machine learning": ["python", "tensorflow", "pytorch", "scikit-learn", "nlp", "computer vision", "ml", "ai"]
-    }
+    skill_list = [s.strip().lower() for s in _SKILL_SPLIT_RE.split(skills) if s.strip()]
     
     # Match position to role
     position_lower = position.lower()
     matched_role = None
     max_match = 0
     
-    for role, keywords in role_skills.items():
+    for role, keywords in _ROLE_SKILLS.items():
         match_score = 0
         for keyword in keywords:
             if keyword in position_lower:
@@ -314,7 +404,7 @@ def calculate_role_match(skills: str, experience: str, position: str) -> Tuple[i
         matched_role = "fullstack"
     
     # Find matching skills
-    relevant_skills = role_skills[matched_role]
+    relevant_skills = _ROLE_SKILLS[matched_role]
     matching_skills = []
     
     for skill in skill_list:
@@ -330,7 +420,7 @@ def calculate_role_match(skills: str, experience: str, position: str) -> Tuple[i
     
     # Adjust based on experience (more experience = higher score)
     try:
-        exp_value = float(re.sub(r'[^\d\.]', '', str(experience)))
+        exp_value = float(_NON_NUMERIC_RE.sub('', str(experience)))
         
         # Adjust for experience
         if exp_value < 2:
@@ -363,7 +453,7 @@ def get_experience_level(experience: str) -> str:
         Experience level (beginner, intermediate, or advanced)
     """
     try:
-        years = float(re.sub(r'[^\d\.]', '', experience))
+        years = float(_NON_NUMERIC_RE.sub('', experience))
         if years < 2:
             return "beginner"
         elif years < 5:
@@ -373,6 +463,56 @@ def get_experience_level(experience: str) -> str:
     except (ValueError, TypeError):
         return "intermediate"  # Default if parsing fails
 
+def _interview_questions_prompt(skill_list: List[str], level_description: str, position: str) -> str:
+    """Build the user prompt for custom interview question generation."""
+    return f"""Generate a set of 3-5 custom technical interview questions for a {position} candidate 
+with {level_description} experience level. The candidate has listed the following skills: {', '.join(skill_list)}.
+
+The questions should:
+1. Focus on the most relevant skills for the {position} position
+2. Be appropriate for someone with {level_description} experience
+3. Include a mix of technical knowledge and problem-solving questions
+4. Be specific and detailed rather than generic
+5. Be formatted as markdown with clear section headings
+
+Format your response with:
+1. A title section
+2. A brief intro explaining the question set
+3. Numbered questions with clear headings indicating the skill being tested
+4. A closing interviewer note section with 2-3 tips for evaluating the responses
+"""
+
+def _fallback_interview_questions(skill_list: List[str], level_description: str, position: str) -> str:
+    """Build generic interview questions for when the API is unavailable."""
+    fallback_questions = f"""
+## Technical Interview Questions for {position}
+
+Based on the candidate's profile (experience level: {level_description}, position: {position}), here are customized technical questions:
+
+### 1. General Experience
+Can you describe your most challenging project related to {position} and how you approached it?
+
+### 2. Problem Solving
+What strategies do you use when debugging complex issues in your code or systems?
+
+### 3. Technical Knowledge
+"""
+    
+    # Add a skill-specific question for the top skills
+    if skill_list:
+        for i, skill in enumerate(skill_list[:2]):
+            fallback_questions += f"\n### {i+3}. {skill.capitalize()} Experience\n"
+            fallback_questions += f"Could you describe your experience with {skill} and how you've applied it in your work?\n"
+    
+    fallback_questions += """
+### Interviewer Notes
+- Focus on the candidate's problem-solving approach rather than specific syntax
+- Evaluate depth of understanding rather than memorized answers
+- Consider how the candidate's experiences align with your team's needs
+"""
+    
+    return fallback_questions
+
 def generate_custom_interview_questions(skills: str, experience_level: str, position: str) -> str:
     """
     Generate custom interview questions based on candidate skills.
@@ -386,42 +526,22 @@ def generate_custom_interview_questions(skills: str, experience_level: str, posi
         Markdown formatted string with interview questions
     """
     import os
-    import groq
     
     # Parse skills
-    skill_list = [s.strip() for s in re.split(r'[,;\s]+', skills) if s.strip()]
+    skill_list = [s.strip() for s in _SKILL_SPLIT_RE.split(skills) if s.strip()]
     
     # Determine experience level
     level_description = get_experience_level(experience_level)
     
     try:
         # Try to use Groq API
-        client = groq.Client(api_key=os.environ.get("GROQ_API_KEY", ""))
-        
-        system_prompt = SYSTEM_PROMPTS["question_generation"]
-        
-        user_prompt = f"""Generate a set of 3-5 custom technical interview questions for a {position} candidate 
-with {level_description} experience level. The candidate has listed the following skills: {', '.join(skill_list)}.
-
-The questions should:
-1. Focus on the most relevant skills for the {position} position
-2. Be appropriate for someone with {level_description} experience
-3. Include a mix of technical knowledge and problem-solving questions
-4. Be specific and detailed rather than generic
-5. Be formatted as markdown with clear section headings
-
-Format your response with:
-1. A title section
-2. A brief intro explaining the question set
-3. Numbered questions with clear headings indicating the skill being tested
-4. A closing interviewer note section with 2-3 tips for evaluating the responses
-"""
+        client = _groq_client(os.environ.get("GROQ_API_KEY", ""))
         
         completion = client.chat.completions.create(
             model="llama3-70b-8192",
             messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
+                {"role": "system", "content": SYSTEM_PROMPTS["question_generation"]},
+                {"role": "user", "content": _interview_questions_prompt(skill_list, level_description, position)}
             ],
             temperature=0.7,
             max_tokens=800
@@ -433,34 +553,56 @@ Format your response with:
         logger.error(f"Error generating interview questions: {str(e)}")
         
         # Create fallback questions if API is unavailable
-        fallback_questions = f"""
-## Technical Interview Questions for {position}
-
-Based on the candidate's profile (experience level: {level_description}, position: {position}), here are customized technical questions:
+        return _fallback_interview_questions(skill_list, level_description, position)
 
-### 1. General Experience
-Can you describe your most challenging project related to {position} and how you approached it?
-
-### 2. Problem Solving
-What strategies do you use when debugging complex issues in your code or systems?
-
-### 3. Technical Knowledge
-"""
+def stream_custom_interview_questions(skills: str, experience_level: str, position: str) -> Iterator[str]:
+    """
+    Stream custom interview questions as they are generated.
+    
+    Args:
+        skills: String containing candidate's skills
+        experience_level: String representing years of experience
+        position: The position they're applying for
+    
+    Yields:
+        Markdown text chunks. If the stream fails before any text arrives,
+        yields the generic fallback questions instead.
+    """
+    import os
+    
+    # Parse skills
+    skill_list = [s.strip() for s in _SKILL_SPLIT_RE.split(skills) if s.strip()]
+    
+    # Determine experience level
+    level_description = get_experience_level(experience_level)
+    
+    started = False
+    try:
+        client = _groq_client(os.environ.get("GROQ_API_KEY", ""))
         
-        # Add a skill-specific question for the top skills
-        if skill_list:
-            for i, skill in enumerate(skill_list[:2]):
-                fallback_questions += f"\n### {i+3}. {skill.capitalize()} Experience\n"
-                fallback_questions += f"Could you describe your experience with {skill} and how you've applied it in your work?\n"
+        stream = client.chat.completions.create(
+            model="llama3-70b-8192",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPTS["question_generation"]},
+                {"role": "user", "content": _interview_questions_prompt(skill_list, level_description, position)}
+            ],
+            temperature=0.7,
+            max_tokens=800,
+            stream=True
+        )
         
-        fallback_questions += """
-### Interviewer Notes
-- Focus on the candidate's problem-solving approach rather than specific syntax
-- Evaluate depth of understanding rather than memorized answers
-- Consider how the candidate's experiences align with your team's needs
-"""
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                started = True
+                yield delta
+    
+    except Exception as e:
+        logger.error(f"Error streaming interview questions: {str(e)}")
         
-        return fallback_questions
+        # Nothing shown yet, so the generic questions can stand in
+        if not started:
+            yield _fallback_interview_questions(skill_list, level_description, position)
 
 def load_dotenv():
     """Load environment variables from .env file if python-dotenv is available."""